@@ -348,10 +348,13 @@ echo -e "${GREEN}✓ PAKA installed to $HOME/.local/bin/paka${NC}"
     if [[ "$install_scope" == "system" ]] || [[ $EUID -eq 0 ]]; then
         sudo mkdir -p "/usr/local/share/paka"
 sudo cp -r src "/usr/local/share/paka/"
+        # Users can't write __pycache__ here, so compile once at install time
+        sudo python3 -m compileall -q "/usr/local/share/paka/src" > /dev/null || true
         echo -e "${GREEN}✓ Python source installed${NC}"
     else
         mkdir -p "$HOME/.local/share/paka"
 cp -r src "$HOME/.local/share/paka/"
+        python3 -m compileall -q "$HOME/.local/share/paka/src" > /dev/null || true
         echo -e "${GREEN}✓ Python source installed${NC}"
     fi
     
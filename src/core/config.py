@@ -3,16 +3,38 @@ Configuration management for PAKA
 """
 
 import json
+import operator
 import os
 import shutil
+import sys
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 
-from .directories import DirectoryManager
+from .directories import get_directory_manager
 from .privilege import PrivilegeManager
 
-@dataclass
+# UIManager is only needed by the interactive editor; resolved on first use
+_ui_manager_cls = None
+
+
+def _get_ui_manager_cls():
+    """Import UIManager lazily and cache the class for later calls"""
+    global _ui_manager_cls
+    if _ui_manager_cls is None:
+        from .ui import UIManager
+        _ui_manager_cls = UIManager
+    return _ui_manager_cls
+
+
+# __slots__ support in dataclasses needs Python 3.10+; older interpreters fall back to __dict__
+_DATACLASS_OPTIONS = {'frozen': True}
+if sys.version_info >= (3, 10):
+    _DATACLASS_OPTIONS['slots'] = True
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PackageManagerConfig:
     """Configuration for a single package manager"""
     name: str
@@ -29,22 +51,13 @@ class PackageManagerConfig:
     auto_confirm_flag: Optional[str] = None
     
     def __post_init__(self):
-        if self.search_flags is None:
-            self.search_flags = []
-        if self.install_flags is None:
-            self.install_flags = []
-        if self.remove_flags is None:
-            self.remove_flags = []
-        if self.purge_flags is None:
-            self.purge_flags = []
-        if self.update_flags is None:
-            self.update_flags = []
-        if self.upgrade_flags is None:
-            self.upgrade_flags = []
-        if self.check_updates_flags is None:
-            self.check_updates_flags = []
+        # Frozen instances need object.__setattr__ to normalise missing flag lists
+        for flags in ('search_flags', 'install_flags', 'remove_flags', 'purge_flags',
+                      'update_flags', 'upgrade_flags', 'check_updates_flags'):
+            if getattr(self, flags) is None:
+                object.__setattr__(self, flags, [])
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PluginConfig:
     """Configuration for a plugin"""
     name: str
@@ -55,16 +68,16 @@ class PluginConfig:
     
     def __post_init__(self):
         if self.dependencies is None:
-            self.dependencies = []
+            object.__setattr__(self, 'dependencies', [])
         if self.hooks is None:
-            self.hooks = []
+            object.__setattr__(self, 'hooks', [])
 
 class Config:
     """Main configuration class for PAKA"""
     
     def __init__(self, config_path: Optional[str] = None, scope: str = 'user'):
         """Initialize configuration with directory and privilege managers"""
-        self.directory_manager = DirectoryManager()
+        self.directory_manager = get_directory_manager()
         self.privilege_manager = PrivilegeManager()
         self.scope = scope
         
@@ -82,14 +95,26 @@ class Config:
             self.config_file = Path(config_path)
         
         # Create directories if they don't exist and we can write to them
-        if self.directory_manager.can_write_to_directory(self.config_dir):
-            self.config_dir.mkdir(parents=True, exist_ok=True)
-        if self.directory_manager.can_write_to_directory(self.history_dir):
-            self.history_dir.mkdir(parents=True, exist_ok=True)
-        if self.directory_manager.can_write_to_directory(self.plugins_dir):
-            self.plugins_dir.mkdir(parents=True, exist_ok=True)
+        for directory in (self.config_dir, self.history_dir, self.plugins_dir):
+            self._ensure_dir(directory)
         
-        self.config = self._load_config()
+        # (config dict, JSON text) from the last save, reused by show_config
+        self._config_serialized: Optional[Tuple[Dict[str, Any], str]] = None
+        self._set_config(self._load_config())
+    
+    def _ensure_dir(self, directory: Path):
+        """Create a directory if it is missing and its location is writable"""
+        # Common case after the first run: one stat and no mkdir/access probes
+        if os.path.isdir(directory):
+            return
+        if self.directory_manager.can_write_to_directory(directory):
+            directory.mkdir(parents=True, exist_ok=True)
+    
+    def _set_config(self, config: Dict[str, Any]):
+        """Install a config dict and rebind the cached settings view"""
+        self.config = config
+        # Same dict object as config['settings'], so in-place edits stay coherent
+        self._settings_view = config.setdefault('settings', {})
     
     def _get_effective_config_dir(self) -> Path:
         """Get effective configuration directory based on scope and privileges"""
@@ -114,6 +139,8 @@ class Config:
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration with all package managers"""
+        # Rebuilt per call on purpose: callers mutate the result, and evaluating
+        # the literal is cheaper than json.loads of a cached blob or a deepcopy
         return {
             "package_managers": {
                 # Fedora/RHEL/CentOS
@@ -364,11 +391,29 @@ class Config:
         }
     
     def _save_config(self, config: Dict[str, Any]):
-        """Save configuration to file"""
+        """Save configuration to file atomically (temp file + rename)"""
+        tmp_path = None
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Write next to the target so os.replace stays on one filesystem;
+            # a crash mid-write then never leaves a truncated config behind
+            with tempfile.NamedTemporaryFile('w', dir=str(self.config_file.parent),
+                                             prefix='.config.', suffix='.tmp',
+                                             delete=False) as f:
+                tmp_path = f.name
+                serialized = json.dumps(config, indent=2)
+                f.write(serialized)
+                f.flush()
+                os.fsync(f.fileno())
+            # NamedTemporaryFile creates 0600 files; keep the config readable
+            if self.config_file.exists():
+                shutil.copymode(str(self.config_file), tmp_path)
+            else:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, str(self.config_file))
+            self._config_serialized = (config, serialized)
         except IOError as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
             print(f"Warning: Could not save config file: {e}")
     
     def get_package_manager_config(self, name: str) -> Optional[PackageManagerConfig]:
@@ -380,13 +425,12 @@ class Config:
     
     def get_enabled_package_managers(self) -> List[PackageManagerConfig]:
         """Get list of enabled package managers sorted by priority"""
-        enabled = []
-        for name, config in self.config["package_managers"].items():
-            if config.get("enabled", True):
-                pm_config = PackageManagerConfig(**config)
-                enabled.append(pm_config)
-        
-        return sorted(enabled, key=lambda x: x.priority)
+        return sorted(
+            (PackageManagerConfig(**config)
+             for config in self.config["package_managers"].values()
+             if config.get("enabled", True)),
+            key=operator.attrgetter('priority')
+        )
     
     def get_enabled_plugins(self) -> List[PluginConfig]:
         """Get list of enabled plugins"""
@@ -400,35 +444,46 @@ class Config:
     
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a setting value"""
-        return self.config["settings"].get(key, default)
+        return self._settings_view.get(key, default)
     
     def set_setting(self, key: str, value: Any):
         """Set a setting value"""
-        self.config["settings"][key] = value
+        if key in self._settings_view and self._settings_view[key] == value:
+            return
+        self._config_serialized = None
+        self._settings_view[key] = value
         self._save_config(self.config)
     
     def enable_package_manager(self, name: str):
         """Enable a package manager"""
-        if name in self.config["package_managers"]:
-            self.config["package_managers"][name]["enabled"] = True
+        entry = self.config["package_managers"].get(name)
+        if entry is not None and entry.get("enabled") is not True:
+            self._config_serialized = None
+            entry["enabled"] = True
             self._save_config(self.config)
     
     def disable_package_manager(self, name: str):
         """Disable a package manager"""
-        if name in self.config["package_managers"]:
-            self.config["package_managers"][name]["enabled"] = False
+        entry = self.config["package_managers"].get(name)
+        if entry is not None and entry.get("enabled") is not False:
+            self._config_serialized = None
+            entry["enabled"] = False
             self._save_config(self.config)
     
     def enable_plugin(self, name: str):
         """Enable a plugin"""
-        if name in self.config["plugins"]:
-            self.config["plugins"][name]["enabled"] = True
+        entry = self.config["plugins"].get(name)
+        if entry is not None and entry.get("enabled") is not True:
+            self._config_serialized = None
+            entry["enabled"] = True
             self._save_config(self.config)
     
     def disable_plugin(self, name: str):
         """Disable a plugin"""
-        if name in self.config["plugins"]:
-            self.config["plugins"][name]["enabled"] = False
+        entry = self.config["plugins"].get(name)
+        if entry is not None and entry.get("enabled") is not False:
+            self._config_serialized = None
+            entry["enabled"] = False
             self._save_config(self.config)
 
 
@@ -438,29 +493,43 @@ class ConfigManager(Config):
     def __init__(self, config_path: Optional[str] = None, scope: str = 'user'):
         """Initialize the config manager"""
         super().__init__(config_path, scope)
+        # Resolved paths keyed by (name, scope) so a scope switch never sees stale entries
+        self._path_cache: Dict[tuple, Any] = {}
+    
+    def _cached_path(self, name: str, resolver):
+        """Resolve a directory lookup once per scope and reuse it afterwards"""
+        key = (name, self.scope)
+        if key not in self._path_cache:
+            self._path_cache[key] = resolver()
+        return self._path_cache[key]
     
     def load_config(self) -> Dict[str, Any]:
         """Load configuration"""
+        # Callers may edit the returned dict in place, so drop the serialized copy
+        self._config_serialized = None
         return self.config
     
     def get_log_dir(self) -> Path:
         """Get log directory"""
         if self.scope == 'system':
-            return self.directory_manager.get_system_log_dir()
+            return self._cached_path('log_dir', self.directory_manager.get_system_log_dir)
         else:
-            return self.directory_manager.get_user_log_dir()
+            return self._cached_path('log_dir', self.directory_manager.get_user_log_dir)
     
     def get_history_file(self) -> Path:
         """Get history file path"""
-        return self.directory_manager.get_history_file(self.scope)
+        return self._cached_path('history_file',
+                                 lambda: self.directory_manager.get_history_file(self.scope))
     
     def get_session_file(self) -> Path:
         """Get session file path"""
-        return self.directory_manager.get_session_file(self.scope)
+        return self._cached_path('session_file',
+                                 lambda: self.directory_manager.get_session_file(self.scope))
     
-    def get_plugin_directories(self) -> Dict[str, Path]:
+    def get_plugin_directories(self) -> Mapping[str, Path]:
         """Get plugin directories for current scope"""
-        return self.directory_manager.get_plugin_directories('all')
+        return self._cached_path('plugin_directories',
+                                 lambda: self.directory_manager.get_plugin_directories('all'))
     
     def can_access_system_config(self) -> bool:
         """Check if current user can access system configuration"""
@@ -481,12 +550,19 @@ class ConfigManager(Config):
     
     def show_config(self):
         """Show current configuration"""
-        print(json.dumps(self.config, indent=2))
+        cached = self._config_serialized
+        if cached is not None and cached[0] is self.config:
+            sys.stdout.write(cached[1])
+        else:
+            # Stream straight to stdout instead of building the whole string first
+            json.dump(self.config, sys.stdout, indent=2)
+        sys.stdout.write('\n')
     
     def edit_config(self):
         """Edit configuration interactively"""
-        from .ui import UIManager
-        ui = UIManager()
+        # The editors below mutate self.config in place
+        self._config_serialized = None
+        ui = _get_ui_manager_cls()()
         
         ui.info("PAKA Configuration Editor")
         ui.info("=" * 30)
@@ -528,7 +604,7 @@ class ConfigManager(Config):
         ui.info("\nPackage Manager Configuration")
         ui.info("-" * 30)
         
-        managers = self.config.get('package_managers', {})
+        managers = self.config.setdefault('package_managers', {})
         for name, config in managers.items():
             enabled = config.get('enabled', False)
             priority = config.get('priority', 0)
@@ -542,82 +618,65 @@ class ConfigManager(Config):
                 except ValueError:
                     ui.error("Invalid priority value, keeping current")
                 
-                managers[name] = {
+                # Update in place so command, flags etc. survive the edit
+                config.update({
                     'enabled': enabled,
                     'priority': priority
-                }
+                })
     
     def _edit_settings(self, ui):
         """Edit general settings"""
         ui.info("\nGeneral Settings")
         ui.info("-" * 20)
         
-        settings = self.config.get('settings', {})
-        
-        auto_confirm = settings.get('auto_confirm', False)
-        auto_confirm = ui.prompt_yes_no(f"Auto-confirm operations (current: {auto_confirm})?", auto_confirm)
-        
-        verbose = settings.get('verbose', False)
-        verbose = ui.prompt_yes_no(f"Verbose output (current: {verbose})?", verbose)
-        
-        color_output = settings.get('color_output', True)
-        color_output = ui.prompt_yes_no(f"Color output (current: {color_output})?", color_output)
-        
-        settings.update({
-            'auto_confirm': auto_confirm,
-            'verbose': verbose,
-            'color_output': color_output
-        })
+        settings = self.config.setdefault('settings', {})
+        auto_confirm, verbose, color_output = (
+            settings.get('auto_confirm', False),
+            settings.get('verbose', False),
+            settings.get('color_output', True)
+        )
         
-        self.config['settings'] = settings
+        settings['auto_confirm'] = ui.prompt_yes_no(f"Auto-confirm operations (current: {auto_confirm})?", auto_confirm)
+        settings['verbose'] = ui.prompt_yes_no(f"Verbose output (current: {verbose})?", verbose)
+        settings['color_output'] = ui.prompt_yes_no(f"Color output (current: {color_output})?", color_output)
     
     def _edit_health_checks(self, ui):
         """Edit health check configuration"""
         ui.info("\nHealth Check Configuration")
         ui.info("-" * 30)
         
-        health_config = self.config.get('health_checks', {})
+        health_config = self.config.setdefault('health_checks', {})
+        auto_fix, check_interval = (
+            health_config.get('auto_fix', False),
+            health_config.get('check_interval', 7)
+        )
         
-        auto_fix = health_config.get('auto_fix', False)
-        auto_fix = ui.prompt_yes_no(f"Auto-fix issues (current: {auto_fix})?", auto_fix)
-        
-        check_interval = health_config.get('check_interval', 7)
+        health_config['auto_fix'] = ui.prompt_yes_no(f"Auto-fix issues (current: {auto_fix})?", auto_fix)
         interval_str = ui.prompt(f"Check interval in days (current: {check_interval}): ")
         try:
             check_interval = int(interval_str) if interval_str.strip() else check_interval
         except ValueError:
             ui.error("Invalid interval value, keeping current")
-        
-        health_config.update({
-            'auto_fix': auto_fix,
-            'check_interval': check_interval
-        })
-        
-        self.config['health_checks'] = health_config
+        health_config['check_interval'] = check_interval
     
     def _edit_history(self, ui):
         """Edit history configuration"""
         ui.info("\nHistory Configuration")
         ui.info("-" * 25)
         
-        history_config = self.config.get('history', {})
+        history_config = self.config.setdefault('history', {})
+        max_entries, auto_cleanup = (
+            history_config.get('max_entries', 1000),
+            history_config.get('auto_cleanup', True)
+        )
         
-        max_entries = history_config.get('max_entries', 1000)
         max_str = ui.prompt(f"Maximum history entries (current: {max_entries}): ")
         try:
             max_entries = int(max_str) if max_str.strip() else max_entries
         except ValueError:
             ui.error("Invalid value, keeping current")
-        
-        auto_cleanup = history_config.get('auto_cleanup', True)
-        auto_cleanup = ui.prompt_yes_no(f"Auto-cleanup old entries (current: {auto_cleanup})?", auto_cleanup)
-        
-        history_config.update({
-            'max_entries': max_entries,
-            'auto_cleanup': auto_cleanup
-        })
-        
-        self.config['history'] = history_config
+        history_config['max_entries'] = max_entries
+        history_config['auto_cleanup'] = ui.prompt_yes_no(f"Auto-cleanup old entries (current: {auto_cleanup})?", auto_cleanup)
     
     def _edit_plugins(self, ui):
         """Edit plugin configuration"""
@@ -642,5 +701,5 @@ class ConfigManager(Config):
         """Reset configuration to defaults"""
         default_config = self._get_default_config()
         self._save_config(default_config)
-        self.config = default_config
+        self._set_config(default_config)
         print("Configuration reset to defaults") 
\ No newline at end of file
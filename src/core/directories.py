@@ -6,137 +6,295 @@ Implements XDG Base Directory specification and system-wide directory standards
 """
 
 import os
+import stat
+import time
+from enum import Enum
+from functools import lru_cache
+from os import environ as _environ
 from pathlib import Path
-from typing import Dict, Optional, Any
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Any, Set, Tuple, Union
+
+class Scope(str, Enum):
+    """Directory scopes; members compare and hash like their string values"""
+    USER = 'user'
+    SYSTEM = 'system'
+    ALL = 'all'
+    
+    def __str__(self) -> str:
+        return self.value
+
+
+# How long (seconds) exists/writable probe results are reused
+_PROBE_TTL = 1.0
+
+# System directories are fixed locations
+_SYSTEM_CONFIG_DIR = Path('/etc/paka')
+_SYSTEM_PLUGINS_DIR = Path('/usr/share/paka/plugins')
+_SYSTEM_HISTORY_DIR = Path('/var/lib/paka')
+_SYSTEM_LOG_DIR = Path('/var/log/paka')
+
+# Returned by get_plugin_directories for unknown scopes
+_NO_PLUGIN_DIRS: Mapping[str, Path] = MappingProxyType({})
+
+# Directories known to exist, shared by every DirectoryManager in the process
+_ensured_dirs: Set[Path] = set()
+
+
+# The user directories depend only on the environment and the home directory,
+# so they are resolved once per process and shared by all DirectoryManagers.
+# Join as plain strings and wrap each result in a Path exactly once, instead of
+# chaining '/' through intermediate Path objects.
+
+@lru_cache(maxsize=None)
+def _user_config_dir() -> Path:
+    """User configuration directory (XDG_CONFIG_HOME/paka)"""
+    config_root = _environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    return Path(os.path.join(config_root, 'paka'))
+
+
+@lru_cache(maxsize=None)
+def _user_data_dir() -> Path:
+    """User data directory (XDG_DATA_HOME/paka), home of history, plugins and logs"""
+    data_root = _environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return Path(os.path.join(data_root, 'paka'))
+
+
+@lru_cache(maxsize=None)
+def _user_plugins_dir() -> Path:
+    """User plugins directory"""
+    return Path(os.path.join(os.fspath(_user_data_dir()), 'plugins'))
+
+
+@lru_cache(maxsize=None)
+def _user_log_dir() -> Path:
+    """User log directory"""
+    return Path(os.path.join(os.fspath(_user_data_dir()), 'logs'))
 
 
 class DirectoryManager:
     """Manages PAKA directories according to XDG and system-wide standards"""
     
+    __slots__ = (
+        '_user_config', '_data_base', '_user_history', '_user_plugins', '_user_log',
+        '_exists_cache', '_writable_cache', '_user_dirs', '_files', '_plugin_dirs_by_scope',
+        '_effective_config_dir', '_effective_plugins_dir', '_dir_info_template'
+    )
+    
     def __init__(self):
         """Initialize directory manager"""
-        self._ensure_directories()
-    
-    def _ensure_directories(self):
-        """Ensure all required directories exist"""
-        # Create user directories
-        self.get_user_config_dir().mkdir(parents=True, exist_ok=True)
-        self.get_user_plugins_dir().mkdir(parents=True, exist_ok=True)
-        self.get_user_history_dir().mkdir(parents=True, exist_ok=True)
-        self.get_user_log_dir().mkdir(parents=True, exist_ok=True)
+        # Resolved once per process by the module-level helpers
+        self._user_config = _user_config_dir()
+        self._data_base = _user_data_dir()
+        self._user_history = self._data_base
+        self._user_plugins = _user_plugins_dir()
+        self._user_log = _user_log_dir()
+        
+        # path -> (monotonic timestamp, result) for recent filesystem probes
+        self._exists_cache: Dict[Path, Tuple[float, bool]] = {}
+        self._writable_cache: Dict[Path, Tuple[float, bool]] = {}
+        
+        # User directories are created on first use, see _ensure_once
+        self._user_dirs = {
+            'config': self._user_config,
+            'plugins': self._user_plugins,
+            'history': self._user_history,
+            'logs': self._user_log
+        }
+        system_dirs = {
+            'config': _SYSTEM_CONFIG_DIR,
+            'plugins': _SYSTEM_PLUGINS_DIR,
+            'history': _SYSTEM_HISTORY_DIR,
+            'logs': _SYSTEM_LOG_DIR
+        }
+        
+        # (kind, scope) -> file path for the get_*_file getters
+        self._files = {
+            ('config', Scope.USER): self._user_config / 'config.json',
+            ('config', Scope.SYSTEM): _SYSTEM_CONFIG_DIR / 'config.json',
+            ('history', Scope.USER): self._user_history / 'history.json',
+            ('history', Scope.SYSTEM): _SYSTEM_HISTORY_DIR / 'history.json',
+            ('session', Scope.USER): self._user_history / 'session.json',
+            ('session', Scope.SYSTEM): _SYSTEM_HISTORY_DIR / 'session.json'
+        }
         
-        # System directories are created by package installation or admin
-        # We don't create them here to avoid permission issues
+        # Read-only, so get_plugin_directories can hand out the same mappings
+        self._plugin_dirs_by_scope = {
+            Scope.ALL: MappingProxyType({
+                Scope.USER: self._user_plugins,
+                Scope.SYSTEM: _SYSTEM_PLUGINS_DIR
+            }),
+            Scope.USER: MappingProxyType({Scope.USER: self._user_plugins}),
+            Scope.SYSTEM: MappingProxyType({Scope.SYSTEM: _SYSTEM_PLUGINS_DIR})
+        }
+        
+        # get_effective_* decisions, resolved on first call
+        self._effective_config_dir: Optional[Path] = None
+        self._effective_plugins_dir: Optional[Path] = None
+        
+        # (info key, path, path string, scope) rows for get_directory_info
+        self._dir_info_template = tuple(
+            (f'{scope}_{name}', path, str(path), scope)
+            for scope, dirs in ((Scope.USER.value, self._user_dirs), (Scope.SYSTEM.value, system_dirs))
+            for name, path in dirs.items()
+        )
+    
+    def _ensure_once(self, kind: str):
+        """Create the user directory of the given kind the first time it is needed"""
+        try:
+            self._mkdir_if_missing(self._user_dirs[kind])
+        except OSError:
+            # Leave the error to whoever actually writes into the directory
+            pass
+    
+    def _mkdir_if_missing(self, directory: Path):
+        """Create a directory unless it is already known to exist"""
+        if directory in _ensured_dirs:
+            return
+        try:
+            is_dir = stat.S_ISDIR(os.stat(os.fspath(directory)).st_mode)
+        except FileNotFoundError:
+            is_dir = False
+        if not is_dir:
+            # Path.mkdir only walks up the tree when the parent is missing
+            directory.mkdir(parents=True, exist_ok=True)
+            self._invalidate_probes(directory)
+        _ensured_dirs.add(directory)
+        _ensured_dirs.update(directory.parents)
     
     def get_user_config_dir(self) -> Path:
         """Get user configuration directory (XDG compliant)"""
-        xdg_config = os.getenv('XDG_CONFIG_HOME')
-        if xdg_config:
-            return Path(xdg_config) / 'paka'
-        else:
-            return Path.home() / '.config' / 'paka'
+        return self._user_config
     
     def get_system_config_dir(self) -> Path:
         """Get system configuration directory"""
-        return Path('/etc/paka')
+        return _SYSTEM_CONFIG_DIR
     
     def get_user_plugins_dir(self) -> Path:
         """Get user plugins directory (XDG compliant)"""
-        xdg_data = os.getenv('XDG_DATA_HOME')
-        if xdg_data:
-            return Path(xdg_data) / 'paka' / 'plugins'
-        else:
-            return Path.home() / '.local' / 'share' / 'paka' / 'plugins'
+        return self._user_plugins
     
     def get_system_plugins_dir(self) -> Path:
         """Get system plugins directory"""
-        return Path('/usr/share/paka/plugins')
+        return _SYSTEM_PLUGINS_DIR
     
     def get_user_history_dir(self) -> Path:
         """Get user history directory (XDG compliant)"""
-        xdg_data = os.getenv('XDG_DATA_HOME')
-        if xdg_data:
-            return Path(xdg_data) / 'paka'
-        else:
-            return Path.home() / '.local' / 'share' / 'paka'
+        return self._user_history
     
     def get_system_history_dir(self) -> Path:
         """Get system history directory"""
-        return Path('/var/lib/paka')
+        return _SYSTEM_HISTORY_DIR
     
     def get_user_log_dir(self) -> Path:
         """Get user log directory (XDG compliant)"""
-        xdg_data = os.getenv('XDG_DATA_HOME')
-        if xdg_data:
-            return Path(xdg_data) / 'paka' / 'logs'
-        else:
-            return Path.home() / '.local' / 'share' / 'paka' / 'logs'
+        return self._user_log
     
     def get_system_log_dir(self) -> Path:
         """Get system log directory"""
-        return Path('/var/log/paka')
+        return _SYSTEM_LOG_DIR
     
-    def get_config_file(self, scope: str = 'user') -> Path:
+    def get_config_file(self, scope: Union[Scope, str] = Scope.USER) -> Path:
         """Get configuration file path"""
-        if scope == 'system':
-            return self.get_system_config_dir() / 'config.json'
+        if scope == Scope.SYSTEM:
+            return self._files[('config', Scope.SYSTEM)]
         else:
-            return self.get_user_config_dir() / 'config.json'
+            self._ensure_once('config')
+            return self._files[('config', Scope.USER)]
     
-    def get_history_file(self, scope: str = 'user') -> Path:
+    def get_history_file(self, scope: Union[Scope, str] = Scope.USER) -> Path:
         """Get history file path"""
-        if scope == 'system':
-            return self.get_system_history_dir() / 'history.json'
+        if scope == Scope.SYSTEM:
+            return self._files[('history', Scope.SYSTEM)]
         else:
-            return self.get_user_history_dir() / 'history.json'
+            self._ensure_once('history')
+            return self._files[('history', Scope.USER)]
     
-    def get_session_file(self, scope: str = 'user') -> Path:
+    def get_session_file(self, scope: Union[Scope, str] = Scope.USER) -> Path:
         """Get session file path"""
-        if scope == 'system':
-            return self.get_system_history_dir() / 'session.json'
+        if scope == Scope.SYSTEM:
+            return self._files[('session', Scope.SYSTEM)]
         else:
-            return self.get_user_history_dir() / 'session.json'
+            self._ensure_once('history')
+            return self._files[('session', Scope.USER)]
     
-    def get_plugin_directories(self, scope: str = 'all') -> Dict[str, Path]:
+    def get_plugin_directories(self, scope: Union[Scope, str] = Scope.ALL) -> Mapping[str, Path]:
         """Get plugin directories for specified scope"""
-        directories = {}
-        
-        if scope in ['user', 'all']:
-            directories['user'] = self.get_user_plugins_dir()
-        
-        if scope in ['system', 'all']:
-            directories['system'] = self.get_system_plugins_dir()
-        
-        return directories
+        return self._plugin_dirs_by_scope.get(scope, _NO_PLUGIN_DIRS)
     
-    def get_plugin_path(self, plugin_name: str, scope: str = 'user') -> Path:
+    def get_plugin_path(self, plugin_name: str, scope: Union[Scope, str] = Scope.USER) -> Path:
         """Get specific plugin directory path"""
-        if scope == 'system':
+        if scope == Scope.SYSTEM:
             return self.get_system_plugins_dir() / plugin_name
         else:
             return self.get_user_plugins_dir() / plugin_name
     
+    def _invalidate_probes(self, directory: Optional[Path] = None):
+        """Forget cached probe results for one directory, or for all of them"""
+        if directory is None:
+            self._exists_cache.clear()
+            self._writable_cache.clear()
+        else:
+            self._exists_cache.pop(directory, None)
+            self._writable_cache.pop(directory, None)
+    
+    def _exists(self, path: Path) -> bool:
+        """os.path.exists() with results reused for _PROBE_TTL seconds"""
+        now = time.monotonic()
+        cached = self._exists_cache.get(path)
+        if cached is not None and now - cached[0] < _PROBE_TTL:
+            return cached[1]
+        # os.path.exists skips the extra Python frames of Path.exists
+        result = os.path.exists(os.fspath(path))
+        self._exists_cache[path] = (now, result)
+        return result
+    
     def can_write_to_directory(self, directory: Path) -> bool:
         """Check if current user can write to directory"""
-        try:
-            # Check if directory exists and is writable
-            if directory.exists():
-                return os.access(directory, os.W_OK)
-            else:
-                # Check if parent directory is writable
-                return os.access(directory.parent, os.W_OK)
-        except Exception:
-            return False
+        return self._writable(directory)
+    
+    def _writable(self, directory: Path, exists: Optional[bool] = None) -> bool:
+        """Cached writability check; pass exists when the caller already knows it"""
+        now = time.monotonic()
+        cached = self._writable_cache.get(directory)
+        if cached is not None and now - cached[0] < _PROBE_TTL:
+            return cached[1]
+        result = self._probe_writable(directory, exists)
+        self._writable_cache[directory] = (now, result)
+        return result
+    
+    def _probe_writable(self, directory: Path, exists: Optional[bool] = None) -> bool:
+        """Uncached writability check used by can_write_to_directory"""
+        # os.access and os.path.exists report ENOENT/EACCES/ENOTDIR as False
+        # rather than raising, so no exception guard is needed here
+        path = os.fspath(directory)
+        if exists is None:
+            # An existing, writable directory is answered by a single access() call
+            if os.access(path, os.W_OK):
+                return True
+            if os.path.exists(path):
+                return False
+        elif exists:
+            return os.access(path, os.W_OK)
+        # Check if parent directory is writable
+        return os.access(os.fspath(directory.parent), os.W_OK)
     
     def get_effective_config_dir(self) -> Path:
         """Get effective config directory (user if available, system as fallback)"""
+        if self._effective_config_dir is None:
+            self._effective_config_dir = self._resolve_effective_config_dir()
+        return self._effective_config_dir
+    
+    def _resolve_effective_config_dir(self) -> Path:
+        """Pick the effective config directory; cached by get_effective_config_dir"""
+        self._ensure_once('config')
         user_config = self.get_user_config_dir()
         system_config = self.get_system_config_dir()
         
         # Prefer user config if it exists or can be created
-        if user_config.exists() or self.can_write_to_directory(user_config):
+        if self._exists(user_config) or self.can_write_to_directory(user_config):
             return user_config
-        elif system_config.exists():
+        elif self._exists(system_config):
             return system_config
         else:
             # Default to user config
@@ -144,13 +302,20 @@ class DirectoryManager:
     
     def get_effective_plugins_dir(self) -> Path:
         """Get effective plugins directory (user if available, system as fallback)"""
+        if self._effective_plugins_dir is None:
+            self._effective_plugins_dir = self._resolve_effective_plugins_dir()
+        return self._effective_plugins_dir
+    
+    def _resolve_effective_plugins_dir(self) -> Path:
+        """Pick the effective plugins directory; cached by get_effective_plugins_dir"""
+        self._ensure_once('plugins')
         user_plugins = self.get_user_plugins_dir()
         system_plugins = self.get_system_plugins_dir()
         
         # Prefer user plugins if it exists or can be created
-        if user_plugins.exists() or self.can_write_to_directory(user_plugins):
+        if self._exists(user_plugins) or self.can_write_to_directory(user_plugins):
             return user_plugins
-        elif system_plugins.exists():
+        elif self._exists(system_plugins):
             return system_plugins
         else:
             # Default to user plugins
@@ -159,45 +324,27 @@ class DirectoryManager:
     def get_directory_info(self) -> Dict[str, Dict[str, Any]]:
         """Get information about all PAKA directories"""
         info = {}
-        
-        # User directories
-        user_dirs = {
-            'config': self.get_user_config_dir(),
-            'plugins': self.get_user_plugins_dir(),
-            'history': self.get_user_history_dir(),
-            'logs': self.get_user_log_dir()
-        }
-        
-        for name, path in user_dirs.items():
-            info[f'user_{name}'] = {
-                'path': str(path),
-                'exists': path.exists(),
-                'writable': self.can_write_to_directory(path),
-                'scope': 'user'
+        for key, path, path_str, scope in self._dir_info_template:
+            exists = self._exists(path)
+            info[key] = {
+                'path': path_str,
+                'exists': exists,
+                'writable': self._writable(path, exists),
+                'scope': scope
             }
-        
-        # System directories
-        system_dirs = {
-            'config': self.get_system_config_dir(),
-            'plugins': self.get_system_plugins_dir(),
-            'history': self.get_system_history_dir(),
-            'logs': self.get_system_log_dir()
-        }
-        
-        for name, path in system_dirs.items():
-            info[f'system_{name}'] = {
-                'path': str(path),
-                'exists': path.exists(),
-                'writable': self.can_write_to_directory(path),
-                'scope': 'system'
-            }
-        
         return info
     
     def ensure_directory(self, directory: Path) -> bool:
         """Ensure a directory exists, creating it if necessary"""
         try:
             directory.mkdir(parents=True, exist_ok=True)
+            self._invalidate_probes(directory)
             return True
         except Exception:
-            return False 
\ No newline at end of file
+            return False
+
+
+@lru_cache(maxsize=1)
+def get_directory_manager() -> DirectoryManager:
+    """Return the process-wide DirectoryManager shared by all PAKA components"""
+    return DirectoryManager()
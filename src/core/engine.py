@@ -8,82 +8,196 @@ between package managers, plugins, and user interface.
 
 import sys
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from pathlib import Path
-from datetime import datetime
 import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 
-from .config import ConfigManager
-from .session import SessionManager
-from .history import HistoryManager
-from .health import HealthManager
+from .config import ConfigManager, _DATACLASS_OPTIONS
 from .ui import UIManager
-from .package_managers import PackageManagerRegistry
-from .plugin_manager import PluginManager, PluginEvent
-from .shell_integration import ShellIntegration
-from .directories import DirectoryManager
+from .directories import get_directory_manager
 from .privilege import PrivilegeManager
-from .command_handlers import CommandHandlers
-from .menu_system import MenuSystem
-from .wizard_system import WizardSystem
+
+
+# Managers shown with the system-package icon in removal prompts
+_SYSTEM_MANAGERS = frozenset(('dnf', 'apt', 'pacman'))
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class Installation:
+    """A package found installed by a live manager search or in history"""
+    manager: str
+    package_name: str
+    display_name: str
+    version: str = 'unknown'
+    description: str = ''
+    size: Any = 'unknown'
+    installed: bool = False
+    source: str = 'live_manager'  # 'live_manager' or 'history'
+    manager_disabled: bool = False
+    installation_timestamp: str = 'unknown'
 
 
 class PAKAEngine:
     """Main engine that orchestrates all PAKA operations"""
     
+    # Command name -> handler(engine, args, options)
+    _COMMAND_TABLE: Dict[str, Callable[['PAKAEngine', List[str], Dict[str, Any]], int]] = {
+        'install': lambda self, a, o: self.command_handlers.handle_install(a, o),
+        'remove': lambda self, a, o: self._handle_remove(a, o),
+        'purge': lambda self, a, o: self.command_handlers.handle_purge(a, o),
+        'update': lambda self, a, o: self.command_handlers.handle_update(a, o),
+        'upgrade': lambda self, a, o: self.command_handlers.handle_upgrade(a, o),
+        'search': lambda self, a, o: self.command_handlers.handle_search(a, o),
+        'health': lambda self, a, o: self.command_handlers.handle_health(a, o),
+        'history': lambda self, a, o: self.command_handlers.handle_history(a, o),
+        'config': lambda self, a, o: self._handle_config(a, o),
+        'shell-not-found': lambda self, a, o: self.command_handlers.handle_shell_not_found(a, o),
+        'reconcile': lambda self, a, o: self._handle_reconcile(a, o),
+    }
+    
     def __init__(self, config_path: Optional[str] = None):
         """Initialize the PAKA engine with configuration"""
-        self.directory_manager = DirectoryManager()
+        self.directory_manager = get_directory_manager()
         self.privilege_manager = PrivilegeManager()
         self.config_manager = ConfigManager(config_path)
-        self.session_manager = SessionManager(self.config_manager)
-        self.history_manager = HistoryManager(self.config_manager)
-        self.health_manager = HealthManager(self.config_manager, self)
         self.ui_manager = UIManager()
-        self.package_manager_registry = PackageManagerRegistry(self.config_manager)
-        
-        # Setup logging
-        self._setup_logging()
-        
-        # Load configuration
-        self.config = self.config_manager.load_config()
         
-        # Initialize package managers
-        self.package_managers = self.package_manager_registry.get_available_managers()
-        
-        # Load plugins
-        self.plugin_manager = PluginManager(self.config_manager)
-        
-        # Initialize shell integration
-        self.shell_integration = ShellIntegration(self.config_manager)
-        
-        # Initialize modular systems
-        self.command_handlers = CommandHandlers(self)
-        self.menu_system = MenuSystem(self)
-        self.wizard_system = WizardSystem(self)
+        # Logging is configured by run_command, the first point that can log
+        self._logging_configured = False
+        
+        # Everything else (package managers, plugins, history, menus) is
+        # imported and built on first access, so commands that never touch
+        # them don't pay for loading them.
+        self._session_manager = None
+        self._history_manager = None
+        self._health_manager = None
+        self._package_manager_registry = None
+        self._plugin_manager = None
+        self._shell_integration = None
+        self._command_handlers = None
+        self._menu_system = None
+        self._wizard_system = None
         
         self.logger = logging.getLogger(__name__)
     
-    def _setup_logging(self):
-        """Setup logging configuration"""
-        log_dir = self.config_manager.get_log_dir()
-        log_dir.mkdir(parents=True, exist_ok=True)
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current configuration, as already loaded by the config manager"""
+        # Not load_config(): it assumes the caller will edit the dict and
+        # drops the serialized copy that show_config() reuses
+        return self.config_manager.config
+    
+    @property
+    def session_manager(self):
+        """Session manager, created on first access"""
+        if self._session_manager is None:
+            from .session import SessionManager
+            self._session_manager = SessionManager(self.config_manager)
+        return self._session_manager
+    
+    @property
+    def history_manager(self):
+        """History manager, created on first access"""
+        if self._history_manager is None:
+            from .history import HistoryManager
+            self._history_manager = HistoryManager(self.config_manager)
+        return self._history_manager
+    
+    @property
+    def health_manager(self):
+        """Health manager, created on first access"""
+        if self._health_manager is None:
+            from .health import HealthManager
+            self._health_manager = HealthManager(self.config_manager, self)
+        return self._health_manager
+    
+    @property
+    def package_manager_registry(self):
+        """Package manager registry, created on first access"""
+        if self._package_manager_registry is None:
+            from .package_managers import PackageManagerRegistry
+            self._package_manager_registry = PackageManagerRegistry(self.config_manager)
+        return self._package_manager_registry
+    
+    @property
+    def package_managers(self):
+        """All available package managers, keyed by name"""
+        return self.package_manager_registry.get_available_managers()
+    
+    @property
+    def plugin_manager(self):
+        """Plugin manager, created (and plugins loaded) on first access"""
+        if self._plugin_manager is None:
+            from .plugin_manager import PluginManager
+            self._plugin_manager = PluginManager(self.config_manager)
+        return self._plugin_manager
+    
+    @property
+    def shell_integration(self):
+        """Shell integration, created on first access"""
+        if self._shell_integration is None:
+            from .shell_integration import ShellIntegration
+            self._shell_integration = ShellIntegration(self.config_manager)
+        return self._shell_integration
+    
+    @property
+    def command_handlers(self):
+        """Command handlers, created on first access"""
+        if self._command_handlers is None:
+            from .command_handlers import CommandHandlers
+            self._command_handlers = CommandHandlers(self)
+        return self._command_handlers
+    
+    @property
+    def menu_system(self):
+        """Menu system, created on first access"""
+        if self._menu_system is None:
+            from .menu_system import MenuSystem
+            self._menu_system = MenuSystem(self)
+        return self._menu_system
+    
+    @property
+    def wizard_system(self):
+        """Configuration wizard, created on first access"""
+        if self._wizard_system is None:
+            from .wizard_system import WizardSystem
+            self._wizard_system = WizardSystem(self)
+        return self._wizard_system
+    
+    def _ensure_logging_configured(self):
+        """Setup logging configuration on first use"""
+        if self._logging_configured:
+            return
+        self._logging_configured = True
+        
+        handlers = [logging.StreamHandler(sys.stdout)]
+        try:
+            log_dir = self.config_manager.get_log_dir()
+            log_dir.mkdir(parents=True, exist_ok=True)
+            handlers.insert(0, logging.FileHandler(log_dir / 'paka.log'))
+        except OSError:
+            # Unwritable log location: keep console logging only
+            pass
         
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_dir / 'paka.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
+            handlers=handlers
         )
     
     def _trigger_plugin_event(self, event: str, context: Dict[str, Any]) -> bool:
         """Trigger a plugin event"""
+        if not self.plugin_manager.has_handlers(event):
+            return True
         return self.plugin_manager.trigger_event(event, context)
     
     def run_command(self, command: str, args: List[str], options: Dict[str, Any]) -> int:
         """Execute a PAKA command with arguments and options"""
+        self._ensure_logging_configured()
+        
         # Check privilege requirements and escalate if needed
         if self.privilege_manager.needs_privilege_escalation(command):
             if not self.privilege_manager.escalate_if_needed(command, self.ui_manager):
@@ -94,33 +208,12 @@ class PAKAEngine:
             self.session_manager.record_command(command, args, options)
             
             # Execute command using command handlers
-            if command == 'install':
-                result = self.command_handlers.handle_install(args, options)
-            elif command == 'remove':
-                result = self._handle_remove(args, options)
-            elif command == 'purge':
-                result = self.command_handlers.handle_purge(args, options)
-            elif command == 'update':
-                result = self.command_handlers.handle_update(args, options)
-            elif command == 'upgrade':
-                result = self.command_handlers.handle_upgrade(args, options)
-            elif command == 'search':
-                result = self.command_handlers.handle_search(args, options)
-            elif command == 'health':
-                result = self.command_handlers.handle_health(args, options)
-            elif command == 'history':
-                result = self.command_handlers.handle_history(args, options)
-            elif command == 'config':
-                result = self._handle_config(args, options)
-            elif command == 'shell-not-found':
-                result = self.command_handlers.handle_shell_not_found(args, options)
-            elif command == 'reconcile':
-                result = self._handle_reconcile(args, options)
-            else:
+            handler = self._COMMAND_TABLE.get(command)
+            if handler is None:
                 self.ui_manager.error(f"Unknown command: {command}")
                 return 1
             
-            return result
+            return handler(self, args, options)
         except Exception as e:
             self.logger.error(f"Error executing command {command}: {e}")
             self.ui_manager.error(f"Command failed: {e}")
@@ -155,33 +248,30 @@ class PAKAEngine:
     
     def _show_config(self):
         """Show current configuration"""
-        self.ui_manager.info("\nPAKA Configuration")
-        self.ui_manager.info("=" * 30)
+        self.ui_manager.write_block(["\nPAKA Configuration", "=" * 30])
         
-        # Show scope info
         scope_info = self.config_manager.get_scope_info()
-        self.ui_manager.display_note(f"Scope: {scope_info['scope']}")
-        self.ui_manager.display_note(f"Running as root: {scope_info['is_root']}")
-        self.ui_manager.display_note("")
-        
-        # Show directories
-        self.ui_manager.display_note("Directories:")
-        self.ui_manager.display_note(f"  Config: {scope_info['config_dir']}")
-        self.ui_manager.display_note(f"  Plugins: {scope_info['plugins_dir']}")
-        self.ui_manager.display_note(f"  History: {scope_info['history_dir']}")
-        self.ui_manager.display_note("")
-        
-        # Show permissions
-        self.ui_manager.display_note("Permissions:")
-        self.ui_manager.display_note(f"  Can write config: {scope_info['can_write_config']}")
-        self.ui_manager.display_note(f"  Can write plugins: {scope_info['can_write_plugins']}")
-        self.ui_manager.display_note(f"  Can write history: {scope_info['can_write_history']}")
-        self.ui_manager.display_note("")
-        
-        # Show configuration data
-        self.ui_manager.display_note("Configuration Data:")
-        import json
-        print(json.dumps(self.config_manager.load_config(), indent=2))
+        self.ui_manager.write_block([
+            # Show scope info
+            f"Scope: {scope_info['scope']}",
+            f"Running as root: {scope_info['is_root']}",
+            "",
+            # Show directories
+            "Directories:",
+            f"  Config: {scope_info['config_dir']}",
+            f"  Plugins: {scope_info['plugins_dir']}",
+            f"  History: {scope_info['history_dir']}",
+            "",
+            # Show permissions
+            "Permissions:",
+            f"  Can write config: {scope_info['can_write_config']}",
+            f"  Can write plugins: {scope_info['can_write_plugins']}",
+            f"  Can write history: {scope_info['can_write_history']}",
+            "",
+            # Show configuration data
+            "Configuration Data:",
+        ], level='note')
+        self.config_manager.show_config()
     
     def _handle_plugin_config(self, args: List[str], options: Dict[str, Any]) -> int:
         """Handle plugin-specific configuration"""
@@ -228,10 +318,9 @@ class PAKAEngine:
             self.ui_manager.error(f"Unknown plugin subcommand: {subcommand}")
             return 1
     
-    def display_timing(self, start_time: datetime, end_time: datetime):
-        """Display timing information"""
-        duration = end_time - start_time
-        self.ui_manager.info(f"Operation completed in {duration.total_seconds():.2f} seconds") 
+    def display_timing(self, start_time: float, end_time: float):
+        """Display timing information (times from time.perf_counter())"""
+        self.ui_manager.info(f"Operation completed in {end_time - start_time:.2f} seconds") 
 
     def _handle_remove(self, args: List[str], options: Dict[str, Any]) -> int:
         """Handle package removal with smart detection"""
@@ -253,37 +342,54 @@ class PAKAEngine:
         # Proceed with normal removal
         return self.command_handlers.handle_remove(packages, options)
     
-    def _detect_multiple_installations(self, package_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    def _detect_multiple_installations(self, package_names: List[str]) -> Dict[str, List[Installation]]:
         """Detect if packages are installed in multiple package managers"""
         multi_installations = {}
+        history_index = self._build_history_index()
+        enabled_managers = self.package_manager_registry.get_enabled_managers()
+        
+        # With at most one live manager, a package can only turn up twice if
+        # history also has it under a manager that is no longer enabled
+        if len(enabled_managers) <= 1 and not any(
+                installation['manager'] not in enabled_managers and not installation.get('removed', False)
+                for package_name in package_names
+                for installation in history_index.get(package_name, ())):
+            return multi_installations
+        
+        search_results = self._search_managers(package_names, enabled_managers)
         
         for package_name in package_names:
             installations = []
+            package_name_lc = package_name.lower()
             
             # First, check history for any packages that might be installed
             # but not found by currently enabled managers
-            history_installations = self._check_history_for_package(package_name)
+            history_installations = self._check_history_for_package(package_name, history_index, enabled_managers)
             installations.extend(history_installations)
             
             # Check each enabled package manager
-            for manager_name, manager in self.package_manager_registry.get_enabled_managers().items():
+            for manager_name in enabled_managers:
                 try:
                     # Try to search for the package to see if it's available/installed
-                    search_result = manager.search(package_name, {})
+                    search_result = search_results[(package_name, manager_name)]
+                    if isinstance(search_result, Exception):
+                        raise search_result
                     if search_result.success and search_result.packages:
                         # Check if any of the found packages match our search
                         for package in search_result.packages:
-                            if package_name.lower() in package.get('name', '').lower():
-                                installations.append({
-                                    'manager': manager_name,
-                                    'package_name': package.get('name', package_name),
-                                    'display_name': package.get('name', package_name),
-                                    'version': package.get('version', 'unknown'),
-                                    'description': package.get('description', ''),
-                                    'size': package.get('size', 'unknown'),
-                                    'installed': package.get('installed', False),
-                                    'source': 'live_manager'
-                                })
+                            found_name = package.get('name', '')
+                            if package_name_lc in found_name.lower():
+                                found_name = package.get('name', package_name)
+                                installations.append(Installation(
+                                    manager=manager_name,
+                                    package_name=found_name,
+                                    display_name=found_name,
+                                    version=package.get('version', 'unknown'),
+                                    description=package.get('description', ''),
+                                    size=package.get('size', 'unknown'),
+                                    installed=package.get('installed', False),
+                                    source='live_manager'
+                                ))
                                 break
                 except Exception as e:
                     self.logger.debug(f"Error checking {package_name} in {manager_name}: {e}")
@@ -293,7 +399,7 @@ class PAKAEngine:
             seen_managers = set()
             
             for install in installations:
-                manager_key = f"{install['manager']}_{install['package_name']}"
+                manager_key = (install.manager, install.package_name)
                 if manager_key not in seen_managers:
                     seen_managers.add(manager_key)
                     unique_installations.append(install)
@@ -303,78 +409,119 @@ class PAKAEngine:
         
         return multi_installations
     
-    def _check_history_for_package(self, package_name: str) -> List[Dict[str, Any]]:
+    def _search_managers(self, package_names: List[str],
+                         managers: Dict[str, Any]) -> Dict[Tuple[str, str], Any]:
+        """Search every manager for every package.
+        
+        Returns {(package_name, manager_name): PackageResult or the exception
+        raised}. Searches are subprocess-bound, so they run concurrently unless
+        the parallel_operations setting is off.
+        """
+        tasks = [(package_name, manager_name, manager)
+                 for package_name in package_names
+                 for manager_name, manager in managers.items()]
+        results = {}
+        
+        if len(tasks) > 1 and self.config_manager.get_setting('parallel_operations', True):
+            with ThreadPoolExecutor(max_workers=min(32, len(tasks))) as pool:
+                futures = {
+                    pool.submit(manager.search, package_name, {}): (package_name, manager_name)
+                    for package_name, manager_name, manager in tasks
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.exception() or future.result()
+        else:
+            for package_name, manager_name, manager in tasks:
+                try:
+                    results[(package_name, manager_name)] = manager.search(package_name, {})
+                except Exception as e:
+                    results[(package_name, manager_name)] = e
+        
+        return results
+    
+    def _build_history_index(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Map each package name to the history installations that include it"""
+        index = defaultdict(list)
+        if not self.history_manager.installation_count():
+            return index
+        
+        for installation in self.history_manager.get_all_installations():
+            for package in set(installation['packages']):
+                index[package].append(installation)
+        return index
+    
+    def _check_history_for_package(self, package_name: str,
+                                   history_index: Dict[str, List[Dict[str, Any]]],
+                                   enabled_managers: Dict[str, Any]) -> List[Installation]:
         """Check history for packages that might not be found by enabled managers"""
         installations = []
         
-        # Get all installations from history
-        all_installations = self.history_manager.get_all_installations()
-        
-        for installation in all_installations:
-            # Skip if already marked as removed
+        for installation in history_index.get(package_name, ()):
+            # Skip if already marked as removed (checked here, not when
+            # indexing, since earlier lookups may have marked it)
             if installation.get('removed', False):
                 continue
             
-            # Check if this installation contains our package
-            if package_name in installation['packages']:
-                manager_name = installation['manager']
-                
-                # Check if the manager is currently enabled
-                manager_instance = self.package_manager_registry.get_manager(manager_name)
-                manager_enabled = manager_instance and manager_instance.is_enabled()
-                
-                # If manager is disabled, include it in results with a note
-                if not manager_enabled:
-                    installations.append({
-                        'manager': manager_name,
-                        'package_name': package_name,
-                        'display_name': package_name,
-                        'version': installation.get('version', 'unknown'),
-                        'description': f"Installed via {manager_name} (manager currently disabled)",
-                        'size': installation.get('size', 'unknown'),
-                        'installed': True,
-                        'source': 'history',
-                        'manager_disabled': True,
-                        'installation_timestamp': installation.get('timestamp', 'unknown')
-                    })
-                else:
-                    # Manager is enabled, check if package is still actually installed
-                    try:
-                        status = self.history_manager.check_package_status(
-                            package_name, manager_name, installation.get('scope', 'user')
+            manager_name = installation['manager']
+            
+            # Check if the manager is currently enabled (is_enabled() walks
+            # PATH, so use the snapshot taken by the caller)
+            manager_enabled = manager_name in enabled_managers
+            
+            # If manager is disabled, include it in results with a note
+            if not manager_enabled:
+                installations.append(Installation(
+                    manager=manager_name,
+                    package_name=package_name,
+                    display_name=package_name,
+                    version=installation.get('version', 'unknown'),
+                    description=f"Installed via {manager_name} (manager currently disabled)",
+                    size=installation.get('size', 'unknown'),
+                    installed=True,
+                    source='history',
+                    manager_disabled=True,
+                    installation_timestamp=installation.get('timestamp', 'unknown')
+                ))
+            else:
+                # Manager is enabled, check if package is still actually installed
+                try:
+                    status = self.history_manager.check_package_status(
+                        package_name, manager_name, installation.get('scope', 'user')
+                    )
+                    
+                    if status['found_in_history'] and not status['still_installed']:
+                        # Package was in history but is no longer installed
+                        # Mark it as removed in history
+                        self.history_manager.mark_packages_removed(
+                            manager_name, [package_name], installation.get('scope', 'user')
                         )
-                        
-                        if status['found_in_history'] and not status['still_installed']:
-                            # Package was in history but is no longer installed
-                            # Mark it as removed in history
-                            self.history_manager.mark_packages_removed(
-                                manager_name, [package_name], installation.get('scope', 'user')
-                            )
-                            continue  # Skip this installation
-                        
-                    except Exception as e:
-                        self.logger.debug(f"Error checking package status for {package_name} in {manager_name}: {e}")
+                        continue  # Skip this installation
+                    
+                except Exception as e:
+                    self.logger.debug(f"Error checking package status for {package_name} in {manager_name}: {e}")
         
         return installations
     
-    def _handle_multi_installation_removal(self, multi_installations: Dict[str, List[Dict[str, Any]]], options: Dict[str, Any]) -> int:
+    def _handle_multi_installation_removal(self, multi_installations: Dict[str, List[Installation]], options: Dict[str, Any]) -> int:
         """Handle removal when multiple installations are detected"""
-        self.ui_manager.info("\nMultiple installations detected:")
-        self.ui_manager.info("=" * 40)
+        lines = ["\nMultiple installations detected:", "=" * 40]
         
         for package_name, installations in multi_installations.items():
-            self.ui_manager.info(f"\n{package_name.upper()}:")
+            lines.append(f"\n{package_name.upper()}:")
             
             for i, install in enumerate(installations, 1):
-                status_icon = "✓" if install['manager'] in ['dnf', 'apt', 'pacman'] else "📦"
-                self.ui_manager.info(f"  {i}. {status_icon} {install['display_name']} ({install['manager']}) - {install['version']}")
-                if install['description']:
-                    self.ui_manager.info(f"      {install['description']}")
-        
-        self.ui_manager.info("\nRemoval options:")
-        self.ui_manager.info("1. Remove specific version(s)")
-        self.ui_manager.info("2. Remove all versions")
-        self.ui_manager.info("3. Cancel")
+                status_icon = "✓" if install.manager in _SYSTEM_MANAGERS else "📦"
+                lines.append(f"  {i}. {status_icon} {install.display_name} ({install.manager}) - {install.version}")
+                if install.description:
+                    lines.append(f"      {install.description}")
+        
+        lines += [
+            "\nRemoval options:",
+            "1. Remove specific version(s)",
+            "2. Remove all versions",
+            "3. Cancel",
+        ]
+        self.ui_manager.write_block(lines)
         
         choice = self.ui_manager.prompt("Enter your choice (1-3): ")
         
@@ -386,15 +533,17 @@ class PAKAEngine:
             self.ui_manager.info("Operation cancelled")
             return 0
     
-    def _selective_removal(self, multi_installations: Dict[str, List[Dict[str, Any]]], options: Dict[str, Any]) -> int:
+    def _selective_removal(self, multi_installations: Dict[str, List[Installation]], options: Dict[str, Any]) -> int:
         """Handle selective removal of specific versions"""
+        selected = []
+        
         for package_name, installations in multi_installations.items():
             self.ui_manager.info(f"\nSelect versions of {package_name} to remove:")
             
             # Show options
             for i, install in enumerate(installations, 1):
-                status_icon = "✓" if install['manager'] in ['dnf', 'apt', 'pacman'] else "📦"
-                self.ui_manager.info(f"  {i}. {status_icon} {install['display_name']} ({install['manager']})")
+                status_icon = "✓" if install.manager in _SYSTEM_MANAGERS else "📦"
+                self.ui_manager.info(f"  {i}. {status_icon} {install.display_name} ({install.manager})")
             
             self.ui_manager.info(f"  {len(installations) + 1}. Skip this package")
             
@@ -403,8 +552,7 @@ class PAKAEngine:
             
             if selection.lower() == 'all':
                 # Remove all versions
-                for install in installations:
-                    self._remove_specific_package(install, options)
+                selected.extend(installations)
             elif selection.strip() == str(len(installations) + 1):
                 # Skip this package
                 continue
@@ -412,44 +560,58 @@ class PAKAEngine:
                 # Remove selected versions
                 try:
                     selected_indices = [int(x.strip()) - 1 for x in selection.split(',')]
-                    for idx in selected_indices:
-                        if 0 <= idx < len(installations):
-                            self._remove_specific_package(installations[idx], options)
                 except ValueError:
                     self.ui_manager.error("Invalid selection")
+                    # Still remove what was chosen for earlier packages
+                    self._remove_installations(selected, options)
                     return 1
+                for idx in selected_indices:
+                    if 0 <= idx < len(installations):
+                        selected.append(installations[idx])
         
+        self._remove_installations(selected, options)
         return 0
     
-    def _remove_specific_package(self, installation: Dict[str, Any], options: Dict[str, Any]) -> int:
-        """Remove a specific package installation"""
-        manager_name = installation['manager']
-        package_name = installation['package_name']
-        
-        self.ui_manager.info(f"Removing {package_name} ({manager_name})...")
-        
-        # Create manager-specific options
-        manager_options = options.copy()
-        manager_options['manager'] = manager_name
-        
-        # Remove using the specific manager
-        result = self.command_handlers.handle_remove([package_name], manager_options)
-        
-        # If removal was successful, mark it as removed in history
-        if result == 0:
-            # Determine scope based on the installation source
-            scope = 'system' if installation.get('source') == 'history' and 'system' in installation.get('description', '') else 'user'
+    def _remove_installations(self, installations: List[Installation], options: Dict[str, Any]) -> int:
+        """Remove package installations, one removal call per package manager"""
+        by_manager = defaultdict(list)
+        for installation in installations:
+            by_manager[installation.manager].append(installation)
+        
+        result = 0
+        removed_by_scope = defaultdict(list)
+        for manager_name, manager_installations in by_manager.items():
+            package_names = [i.package_name for i in manager_installations]
+            for package_name in package_names:
+                self.ui_manager.info(f"Removing {package_name} ({manager_name})...")
+            
+            # Create manager-specific options
+            manager_options = options.copy()
+            manager_options['manager'] = manager_name
+            
+            # Remove using the specific manager
+            manager_result = self.command_handlers.handle_remove(package_names, manager_options)
+            if manager_result != 0:
+                result = manager_result
+                continue
             
-            # Mark as removed in history
-            self.history_manager.mark_packages_removed(manager_name, [package_name], scope)
+            # Removal was successful, queue it to be marked as removed in history
+            for installation in manager_installations:
+                # Determine scope based on the installation source
+                scope = 'system' if installation.source == 'history' and 'system' in installation.description else 'user'
+                removed_by_scope[(manager_name, scope)].append(installation.package_name)
             
             # If this was from a disabled manager, show a note
-            if installation.get('manager_disabled', False):
+            if any(i.manager_disabled for i in manager_installations):
                 self.ui_manager.info(f"Note: {manager_name} manager is currently disabled. Re-enable it to manage future {manager_name} packages.")
         
+        # One history update (and file write) per manager and scope
+        for (manager_name, scope), package_names in removed_by_scope.items():
+            self.history_manager.mark_packages_removed(manager_name, package_names, scope)
+        
         return result
     
-    def _remove_all_versions(self, multi_installations: Dict[str, List[Dict[str, Any]]], options: Dict[str, Any]) -> int:
+    def _remove_all_versions(self, multi_installations: Dict[str, List[Installation]], options: Dict[str, Any]) -> int:
         """Remove all versions of packages"""
         self.ui_manager.warning("This will remove ALL versions of the specified packages!")
         
@@ -457,11 +619,13 @@ class PAKAEngine:
             self.ui_manager.info("Operation cancelled")
             return 0
         
-        for package_name, installations in multi_installations.items():
+        for package_name in multi_installations:
             self.ui_manager.info(f"Removing all versions of {package_name}...")
-            
-            for install in installations:
-                self._remove_specific_package(install, options)
+        
+        self._remove_installations(
+            [install for installations in multi_installations.values() for install in installations],
+            options
+        )
         
         return 0 
 
@@ -480,10 +644,12 @@ class PAKAEngine:
         results = self.history_manager.reconcile_package_status(scope)
         
         # Display results
-        self.ui_manager.info(f"\nReconciliation Results:")
-        self.ui_manager.info(f"  Packages checked: {results['checked']}")
-        self.ui_manager.info(f"  Packages marked as removed: {results['marked_removed']}")
-        self.ui_manager.info(f"  Errors encountered: {results['errors']}")
+        self.ui_manager.write_block([
+            "\nReconciliation Results:",
+            f"  Packages checked: {results['checked']}",
+            f"  Packages marked as removed: {results['marked_removed']}",
+            f"  Errors encountered: {results['errors']}",
+        ])
         
         if results['details']:
             self.ui_manager.info(f"\nDetails:")
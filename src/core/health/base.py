@@ -6,14 +6,17 @@ Defines the base health manager and common functionality for health checks.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 
-from ..config import ConfigManager
-from ..plugin_manager import PluginEvent
+from ..config import ConfigManager, _DATACLASS_OPTIONS
 
 
-class HealthCheck(NamedTuple):
+@dataclass(**_DATACLASS_OPTIONS)
+class HealthCheck:
     """Represents a health check result"""
     name: str
     status: str  # 'ok', 'warning', 'error'
@@ -41,54 +44,44 @@ class HealthManager:
         
         ui.display_header("Running PAKA Package Manager Health Checks...")
         
-        all_checks = []
-        
-        # 1. Package manager health checks
-        ui.display_section("Checking package managers...")
-        all_checks.extend(checkers.check_package_managers())
-        
-        # 2. Package manager cache health
-        ui.display_section("Checking package caches...")
-        all_checks.extend(checkers.check_package_caches())
-        
-        # 3. Disk bloat and package cleanup
-        ui.display_section("Checking disk bloat and package cleanup...")
-        all_checks.extend(checkers.check_disk_bloat())
-        
-        # 4. Partial installations and locks
-        ui.display_section("Checking partial installations and locks...")
-        all_checks.extend(checkers.check_partial_installations())
-        
-        # 5. Purge history and orphaned packages
-        ui.display_section("Checking purge history and orphaned packages...")
-        all_checks.extend(checkers.check_purge_history())
-        
-        # 6. Package manager database health
-        ui.display_section("Checking package databases...")
-        all_checks.extend(checkers.check_package_databases())
-        
-        # 7. Third-party repository health
-        ui.display_section("Checking third-party repositories...")
-        all_checks.extend(checkers.check_third_party_repos())
+        sections = (
+            ("Checking package managers...", checkers.check_package_managers),
+            ("Checking package caches...", checkers.check_package_caches),
+            ("Checking disk bloat and package cleanup...", checkers.check_disk_bloat),
+            ("Checking partial installations and locks...", checkers.check_partial_installations),
+            ("Checking purge history and orphaned packages...", checkers.check_purge_history),
+            ("Checking package databases...", checkers.check_package_databases),
+            ("Checking third-party repositories...", checkers.check_third_party_repos),
+        )
+        all_checks = list(chain.from_iterable(self._run_sections(ui, sections)))
         
         ui.display_section("")  # Empty line
         
-        # Handle fixes
+        # Handle fixes; the UI triggers pre-health right before it applies any
         if options.get('fix_all'):
-            # Trigger pre-health event before applying fixes
-            if self.engine:
-                health_context = {
-                    'checks': all_checks,
-                    'fix_count': len([c for c in all_checks if c.fix_command]),
-                    'options': options
-                }
-                self.engine._trigger_plugin_event(PluginEvent.PRE_HEALTH, health_context)
-            return ui.fix_all_issues(all_checks, self.engine)
+            return ui.fix_all_issues(all_checks, self.engine, options)
         else:
-            # For interactive mode, we need to trigger pre-health before any fixes
-            # We'll do this in the UI methods that handle fixes
             return ui.interactive_health_overview(all_checks, self.engine)
     
+    def _run_sections(self, ui, sections):
+        """Run check sections, announcing each as its results are consumed.
+        
+        Checks mostly wait on package manager subprocesses, so unless the
+        parallel_operations setting is off they all start at once; headers
+        and results still come out in section order.
+        """
+        if not self.config_manager.get_setting('parallel_operations', True):
+            for label, check in sections:
+                ui.display_section(label)
+                yield check()
+            return
+        
+        with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+            futures = [(label, pool.submit(check)) for label, check in sections]
+            for label, future in futures:
+                ui.display_section(label)
+                yield future.result()
+    
     def create_check(self, name: str, status: str, message: str, fix_command: Optional[str] = None, fix_description: Optional[str] = None) -> HealthCheck:
         """Create a health check result"""
         return HealthCheck(
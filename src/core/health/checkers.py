@@ -5,62 +5,298 @@ Health Checkers Module
 Contains all the health check logic for different aspects of the system.
 """
 
+import os
+import re
 import subprocess
 import shutil
 import logging
-from typing import Dict, List, Any
-from pathlib import Path
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, wraps
+from typing import Callable, Dict, List, Any, Optional, Tuple
 
 from .base import HealthCheck
 from ..config import ConfigManager
 
 
+# How long subprocess probe results stay valid on a HealthCheckers instance
+_PROBE_TTL = 300.0
+
+# Package manager cache directories, checked for size
+_CACHE_DIRS = (
+    ('/var/cache/apt', 'apt'),
+    ('/var/cache/dnf', 'dnf'),
+    ('/var/cache/pacman', 'pacman'),
+    ('/var/cache/zypper', 'zypper'),
+    ('/var/cache/flatpak', 'flatpak'),
+    ('/var/cache/apk', 'apk'),
+    ('/var/cache/xbps', 'xbps'),
+    ('/var/cache/emerge', 'emerge'),
+    ('/var/cache/slackpkg', 'slackpkg'),
+    ('/var/cache/nix', 'nix'),
+)
+
+# Lock files left behind by interrupted or running package managers
+_LOCK_FILES = (
+    ('/var/lib/dnf/rpmdb_lock', 'DNF'),
+    ('/var/lib/pacman/db.lck', 'Pacman'),
+    ('/var/lib/apt/lists/lock', 'APT'),
+    ('/var/lib/dpkg/lock', 'DPKG'),
+    ('/var/lib/dpkg/lock-frontend', 'DPKG'),
+    ('/var/lib/zypp/lock', 'Zypper'),
+    ('/var/lib/portage/world.lock', 'Portage'),
+    ('/var/lib/xbps/.xbps-lock', 'XBPS'),
+    ('/var/lib/apk/lock', 'APK'),
+    ('/var/lib/flatpak/.lock', 'Flatpak'),
+)
+
+# Directories holding files of interrupted transactions
+_PARTIAL_DIRS = (
+    ('/var/lib/dnf/transaction', 'DNF'),
+    ('/var/lib/apt/lists/partial', 'APT'),
+    ('/var/lib/pacman/db.lck', 'Pacman'),
+)
+
+# Per-probe timeouts in seconds; anything that may talk to a mirror gets longer
+_CHECK_TIMEOUT = 5
+_SYNC_TIMEOUT = 30
+
+# Case-insensitive scans of probe output; searching with these avoids
+# lowering a copy of the whole stream first
+_BROKEN_RE = re.compile(r'broken', re.IGNORECASE)
+_RPMDB_RE = re.compile(r'rpmdb', re.IGNORECASE)
+_REPO_ERROR_RE = re.compile(r'^.*(?:error|failed).*$', re.IGNORECASE | re.MULTILINE)
+
+# Where pacman keeps the repository databases fetched by `pacman -Sy`
+_PACMAN_SYNC_DIR = '/var/lib/pacman/sync'
+
+# Orphaned package probes: (manager, command, check name)
+_ORPHAN_CHECKS = (
+    ('dnf', 'dnf autoremove --dry-run', 'DNF orphaned packages'),
+    ('apt', 'apt autoremove --dry-run', 'APT orphaned packages'),
+    ('pacman', 'pacman -Qdt', 'Pacman orphaned packages'),
+    ('zypper', 'zypper packages --orphaned', 'Zypper orphaned packages'),
+)
+
+
+def _run(cmd: List[str], timeout: float = _CHECK_TIMEOUT) -> Optional[subprocess.CompletedProcess]:
+    """Run a probe command, returning None if it does not finish in time"""
+    try:
+        return subprocess.run(cmd, capture_output=True, text=True, errors='replace', timeout=timeout)
+    except subprocess.TimeoutExpired:
+        logging.getLogger(__name__).debug(f"Timed out after {timeout}s: {' '.join(cmd)}")
+        return None
+
+
+@lru_cache(maxsize=None)
+def _probe_pool() -> ThreadPoolExecutor:
+    """Process-wide worker pool shared by every probe fan-out"""
+    return ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4,
+                              thread_name_prefix='paka-health')
+
+
+@lru_cache(maxsize=256)
+def _which(command: str):
+    """shutil.which, memoized; cleared by HealthCheckers.invalidate()"""
+    return shutil.which(command)
+
+
+def _cached(ttl: float):
+    """Memoize a HealthCheckers probe per instance for ttl seconds.
+    
+    Results are keyed on the method and its arguments (the manager command),
+    so repeated sweeps through the same checker don't rerun slow subprocesses.
+    HealthCheckers.invalidate() drops everything.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args):
+            key = (method.__name__,) + args
+            now = time.monotonic()
+            cached = self._result_cache.get(key)
+            if cached is not None and now - cached[0] < ttl:
+                return list(cached[1])
+            checks = method(self, *args)
+            self._result_cache[key] = (now, tuple(checks))
+            return checks
+        return wrapper
+    return decorator
+
+
+def _dir_size(path: str, st: Optional[os.stat_result] = None) -> int:
+    """Disk usage of a directory tree in bytes, like `du -s`.
+    
+    Pass the directory's stat result as st if it is already known.
+    Subdirectories that can't be read are skipped rather than failing the
+    whole walk.
+    """
+    if st is None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return 0
+    total = st.st_blocks * 512
+    
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        total += entry.stat(follow_symlinks=False).st_blocks * 512
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def _dir_size_fast(path: str, st: os.stat_result) -> int:
+    """Like _dir_size, but read usage off the filesystem if path is its own mount.
+    
+    A cache on a dedicated partition is the only thing on it, so statvfs gives
+    its usage without walking every file.
+    """
+    try:
+        if st.st_dev != os.stat(os.path.dirname(path)).st_dev:
+            vfs = os.statvfs(path)
+            return (vfs.f_blocks - vfs.f_bfree) * vfs.f_frsize
+    except OSError:
+        pass
+    return _dir_size(path, st)
+
+
+def _has_entries(path: str) -> bool:
+    """Whether a directory contains anything, stopping at the first entry"""
+    with os.scandir(path) as it:
+        return next(it, None) is not None
+
+
+def _humanize(size: int) -> str:
+    """Format a byte count the way `du -h` does (e.g. 5.2G)"""
+    for unit in ('B', 'K', 'M', 'G'):
+        if size < 1024:
+            return f"{size:.1f}{unit}" if unit != 'B' else f"{size}{unit}"
+        size /= 1024
+    return f"{size:.1f}T"
+
+
+def _warn(name: str, message: str, fix_command: str, fix_description: str) -> HealthCheck:
+    """A warning-level finding"""
+    return HealthCheck(name, "warning", message, fix_command, fix_description)
+
+
+def _err(name: str, message: str, fix_command: str, fix_description: str) -> HealthCheck:
+    """An error-level finding"""
+    return HealthCheck(name, "error", message, fix_command, fix_description)
+
+
 class HealthCheckers:
     """Contains all health check logic"""
     
+    # Managers with a _check_<name>_health method
+    _MANAGER_CHECKS = frozenset((
+        'dnf', 'apt', 'pacman', 'flatpak', 'snap', 'zypper', 'emerge',
+        'yay', 'slackpkg', 'apk', 'xbps', 'apx', 'nix', 'slpkg',
+    ))
+    
     def __init__(self, config_manager: ConfigManager):
         """Initialize health checkers"""
         self.config_manager = config_manager
         self.logger = logging.getLogger(__name__)
+        self._config = None
+        self._stat_cache: Dict[str, Optional[os.stat_result]] = {}
+        self._result_cache: Dict[Tuple[str, ...], Tuple[float, Tuple[HealthCheck, ...]]] = {}
+        self._cache_sizes: Optional[Dict[str, int]] = None
+        self._cache_sizes_lock = threading.Lock()
+    
+    def _stat(self, path: str) -> Optional[os.stat_result]:
+        """os.stat of a well-known path, or None if missing; memoized per instance"""
+        try:
+            return self._stat_cache[path]
+        except KeyError:
+            pass
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        self._stat_cache[path] = st
+        return st
+    
+    def _get_config(self) -> Dict[str, Any]:
+        """Configuration, loaded once per checker instance"""
+        if self._config is None:
+            self._config = self.config_manager.load_config()
+        return self._config
+    
+    @contextmanager
+    def _safe(self, label: str):
+        """Swallow a failed probe (missing binary, I/O or subprocess error), logging it"""
+        try:
+            yield
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.debug(f"{label} check skipped: {e}")
+    
+    def invalidate(self):
+        """Drop memoized config, lookups and probe results so the next checks re-probe"""
+        self._config = None
+        self._stat_cache = {}
+        self._result_cache = {}
+        self._cache_sizes = None
+        _which.cache_clear()
+    
+    def _run_checks_parallel(self, funcs: List[Callable[[], List[HealthCheck]]]) -> List[HealthCheck]:
+        """Run independent check functions concurrently, keeping their order.
+        
+        Each function usually just waits on a package manager subprocess. A
+        function that raises is logged and contributes no checks.
+        """
+        def run(func):
+            try:
+                return func()
+            except Exception as e:
+                self.logger.error(f"Health check {getattr(func, '__name__', func)} failed: {e}")
+                return []
+        
+        checks = []
+        if len(funcs) <= 1 or not self.config_manager.get_setting('parallel_operations', True):
+            for func in funcs:
+                checks.extend(run(func))
+            return checks
+        
+        for result in _probe_pool().map(run, funcs):
+            checks.extend(result)
+        return checks
+    
+    def _scan_cache_sizes(self) -> Dict[str, int]:
+        """Size in bytes of each existing package manager cache, walked once per checker"""
+        with self._cache_sizes_lock:
+            if self._cache_sizes is None:
+                sizes = {}
+                for cache_dir, manager in _CACHE_DIRS:
+                    st = self._stat(cache_dir)
+                    if st is not None:
+                        sizes[manager] = _dir_size_fast(cache_dir, st)
+                self._cache_sizes = sizes
+            return self._cache_sizes
     
     def check_package_caches(self) -> List[HealthCheck]:
         """Check package manager caches safely"""
         checks = []
         
         # Check for large package caches across all package managers
-        cache_dirs = [
-            ('/var/cache/apt', 'apt'),
-            ('/var/cache/dnf', 'dnf'),
-            ('/var/cache/pacman', 'pacman'),
-            ('/var/cache/zypper', 'zypper'),
-            ('/var/cache/flatpak', 'flatpak'),
-            ('/var/cache/apk', 'apk'),
-            ('/var/cache/xbps', 'xbps'),
-            ('/var/cache/emerge', 'emerge'),
-            ('/var/cache/slackpkg', 'slackpkg'),
-            ('/var/cache/nix', 'nix')
-        ]
-        
-        for cache_dir, manager in cache_dirs:
-            if Path(cache_dir).exists():
-                try:
-                    result = subprocess.run(['du', '-sh', cache_dir], 
-                                          capture_output=True, text=True)
-                    if result.returncode == 0:
-                        size_str = result.stdout.split()[0]
-                        # Extract size in MB/GB
-                        if 'G' in size_str:
-                            size_gb = float(size_str.replace('G', ''))
-                            if size_gb > 5:  # More than 5GB
-                                checks.append(HealthCheck(
-                                    name=f"Large {manager} Cache",
-                                    status="warning",
-                                    message=f"{manager} cache is {size_str}",
-                                    fix_command=f"{manager} clean all",
-                                    fix_description=f"Clean large {manager} cache"
-                                ))
-                except Exception:
-                    pass
+        for manager, size in self._scan_cache_sizes().items():
+            if size > 5 * 1024 ** 3:  # More than 5GB
+                checks.append(_warn(
+                    f"Large {manager} Cache",
+                    f"{manager} cache is {_humanize(size)}",
+                    f"{manager} clean all",
+                    f"Clean large {manager} cache"
+                ))
         
         return checks
     
@@ -69,70 +305,46 @@ class HealthCheckers:
         checks = []
         
         # Check for lock files across all package managers
-        lock_files = [
-            ('/var/lib/dnf/rpmdb_lock', 'DNF'),
-            ('/var/lib/pacman/db.lck', 'Pacman'),
-            ('/var/lib/apt/lists/lock', 'APT'),
-            ('/var/lib/dpkg/lock', 'DPKG'),
-            ('/var/lib/dpkg/lock-frontend', 'DPKG'),
-            ('/var/lib/zypp/lock', 'Zypper'),
-            ('/var/lib/portage/world.lock', 'Portage'),
-            ('/var/lib/xbps/.xbps-lock', 'XBPS'),
-            ('/var/lib/apk/lock', 'APK'),
-            ('/var/lib/flatpak/.lock', 'Flatpak')
-        ]
-        
-        for lock_file, manager in lock_files:
-            if Path(lock_file).exists():
-                checks.append(HealthCheck(
-                    name=f"{manager} Lock File",
-                    status="warning",
-                    message=f"{manager} lock file exists: {Path(lock_file).name}",
-                    fix_command=f"rm -f {lock_file}",
-                    fix_description=f"Remove {manager} lock file (package manager may be running)"
+        for lock_file, manager in _LOCK_FILES:
+            if self._stat(lock_file) is not None:
+                checks.append(_warn(
+                    f"{manager} Lock File",
+                    f"{manager} lock file exists: {os.path.basename(lock_file)}",
+                    f"rm -f {lock_file}",
+                    f"Remove {manager} lock file (package manager may be running)"
                 ))
         
         # Check for partial installations
-        partial_dirs = [
-            ('/var/lib/dnf/transaction', 'DNF'),
-            ('/var/lib/apt/lists/partial', 'APT'),
-            ('/var/lib/pacman/db.lck', 'Pacman')
-        ]
-        
-        for partial_dir, manager in partial_dirs:
-            if Path(partial_dir).exists():
-                try:
-                    files = list(Path(partial_dir).glob('*'))
-                    if files:
-                        checks.append(HealthCheck(
-                            name=f"{manager} Partial Installation",
-                            status="error",
-                            message=f"{manager} has incomplete transaction files",
-                            fix_command=f"rm -rf {partial_dir}/*",
-                            fix_description=f"Clean {manager} partial installation files"
+        for partial_dir, manager in _PARTIAL_DIRS:
+            if self._stat(partial_dir) is not None:
+                with self._safe('package databases'):
+                    if _has_entries(partial_dir):
+                        checks.append(_err(
+                            f"{manager} Partial Installation",
+                            f"{manager} has incomplete transaction files",
+                            f"rm -rf {partial_dir}/*",
+                            f"Clean {manager} partial installation files"
                         ))
-                except Exception:
-                    pass
         
         return checks
     
     def check_package_managers(self) -> List[HealthCheck]:
         """Check package manager health"""
-        checks = []
-        config = self.config_manager.load_config()
+        config = self._get_config()
+        manager_checks = []
         
         for manager_name, manager_config in config['package_managers'].items():
             if not manager_config.get('enabled', True):
                 continue
             
             command = manager_config.get('command')
-            if not command or not shutil.which(command):
+            if not command or not _which(command):
                 continue  # Skip unavailable package managers
             
             # Check package manager specific health
-            checks.extend(self._check_manager_health(manager_name, manager_config))
+            manager_checks.append(partial(self._check_manager_health, manager_name, manager_config))
         
-        return checks
+        return self._run_checks_parallel(manager_checks)
     
     def _check_manager_health(self, manager_name: str, config: Dict[str, Any]) -> List[HealthCheck]:
         """Check health of a specific package manager"""
@@ -143,453 +355,452 @@ class HealthCheckers:
             return checks
         
         # Check all supported package managers for actual problems
-        manager_checks = {
-            'dnf': self._check_dnf_health,
-            'apt': self._check_apt_health,
-            'pacman': self._check_pacman_health,
-            'flatpak': self._check_flatpak_health,
-            'snap': self._check_snap_health,
-            'zypper': self._check_zypper_health,
-            'emerge': self._check_emerge_health,
-            'yay': self._check_yay_health,
-            'slackpkg': self._check_slackpkg_health,
-            'apk': self._check_apk_health,
-            'xbps': self._check_xbps_health,
-            'apx': self._check_apx_health,
-            'nix': self._check_nix_health,
-            'slpkg': self._check_slpkg_health
-        }
-        
-        if manager_name in manager_checks:
+        if manager_name in self._MANAGER_CHECKS:
             try:
-                checks.extend(manager_checks[manager_name](command))
+                checks.extend(getattr(self, f'_check_{manager_name}_health')(command))
             except Exception as e:
                 self.logger.error(f"Error checking {manager_name} health: {e}")
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_dnf_health(self, command: str) -> List[HealthCheck]:
         """Check DNF health"""
         checks = []
         
-        # Check for broken packages
-        try:
-            result = subprocess.run([command, 'check'], capture_output=True, text=True)
-            if result.returncode != 0 and 'broken' in result.stderr.lower():
-                checks.append(HealthCheck(
-                    name="DNF Broken Packages",
-                    status="error",
-                    message="DNF has broken packages that need fixing",
-                    fix_command="dnf check-update && dnf upgrade",
-                    fix_description="Fix broken DNF packages"
+        # One `dnf check` reports both broken packages and RPM database
+        # corruption, so don't pay for a second rpmdb open with check-update
+        with self._safe('dnf health'):
+            result = _run([command, 'check'], timeout=10)
+            if result is None or result.returncode == 0:
+                return checks
+            if _BROKEN_RE.search(result.stderr):
+                checks.append(_err(
+                    "DNF Broken Packages",
+                    "DNF has broken packages that need fixing",
+                    "dnf check-update && dnf upgrade",
+                    "Fix broken DNF packages"
                 ))
-        except Exception:
-            pass
-        
-        # Check for corrupted RPM database
-        try:
-            result = subprocess.run([command, 'check-update'], capture_output=True, text=True)
-            if result.returncode != 0 and 'rpmdb' in result.stderr.lower():
-                checks.append(HealthCheck(
-                    name="DNF Corrupted Database",
-                    status="error",
-                    message="DNF RPM database is corrupted",
-                    fix_command="dnf clean all && dnf makecache",
-                    fix_description="Rebuild DNF database"
+            if _RPMDB_RE.search(result.stderr):
+                checks.append(_err(
+                    "DNF Corrupted Database",
+                    "DNF RPM database is corrupted",
+                    "dnf clean all && dnf makecache",
+                    "Rebuild DNF database"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_apt_health(self, command: str) -> List[HealthCheck]:
         """Check APT health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, 'check'], capture_output=True, text=True)
+        with self._safe('apt health'):
+            result = _run([command, 'check'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="APT Broken Packages",
-                    status="error",
-                    message="APT has broken packages that need fixing",
-                    fix_command="apt --fix-broken install",
-                    fix_description="Fix broken APT packages"
+                checks.append(_err(
+                    "APT Broken Packages",
+                    "APT has broken packages that need fixing",
+                    "apt --fix-broken install",
+                    "Fix broken APT packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_pacman_health(self, command: str) -> List[HealthCheck]:
         """Check Pacman health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, '-Qk'], capture_output=True, text=True)
+        with self._safe('pacman health'):
+            result = _run([command, '-Qk'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Pacman Broken Packages",
-                    status="error",
-                    message="Pacman has broken packages that need fixing",
-                    fix_command="pacman -Syu",
-                    fix_description="Fix broken Pacman packages"
+                checks.append(_err(
+                    "Pacman Broken Packages",
+                    "Pacman has broken packages that need fixing",
+                    "pacman -Syu",
+                    "Fix broken Pacman packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_flatpak_health(self, command: str) -> List[HealthCheck]:
         """Check Flatpak health"""
         checks = []
         
         # Check for broken installations
-        try:
-            result = subprocess.run([command, 'list'], capture_output=True, text=True)
+        with self._safe('flatpak health'):
+            result = _run([command, 'list'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Flatpak Broken Installation",
-                    status="error",
-                    message="Flatpak installation is broken",
-                    fix_command="flatpak repair",
-                    fix_description="Repair Flatpak installation"
+                checks.append(_err(
+                    "Flatpak Broken Installation",
+                    "Flatpak installation is broken",
+                    "flatpak repair",
+                    "Repair Flatpak installation"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_snap_health(self, command: str) -> List[HealthCheck]:
         """Check Snap health"""
         checks = []
         
         # Check for broken snaps
-        try:
-            result = subprocess.run([command, 'list'], capture_output=True, text=True)
+        with self._safe('snap health'):
+            result = _run([command, 'list'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Snap Broken Installation",
-                    status="error",
-                    message="Snap installation is broken",
-                    fix_command="snap refresh",
-                    fix_description="Refresh Snap installation"
+                checks.append(_err(
+                    "Snap Broken Installation",
+                    "Snap installation is broken",
+                    "snap refresh",
+                    "Refresh Snap installation"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_zypper_health(self, command: str) -> List[HealthCheck]:
         """Check Zypper health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, 'verify'], capture_output=True, text=True)
+        with self._safe('zypper health'):
+            result = _run([command, 'verify'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Zypper Broken Packages",
-                    status="error",
-                    message="Zypper has broken packages that need fixing",
-                    fix_command="zypper dup",
-                    fix_description="Fix broken Zypper packages"
+                checks.append(_err(
+                    "Zypper Broken Packages",
+                    "Zypper has broken packages that need fixing",
+                    "zypper dup",
+                    "Fix broken Zypper packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_emerge_health(self, command: str) -> List[HealthCheck]:
         """Check Emerge health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, '--check-news'], capture_output=True, text=True)
+        with self._safe('emerge health'):
+            result = _run([command, '--check-news'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Emerge Broken Packages",
-                    status="error",
-                    message="Emerge has broken packages that need fixing",
-                    fix_command="emerge --sync && emerge -u world",
-                    fix_description="Fix broken Emerge packages"
+                checks.append(_err(
+                    "Emerge Broken Packages",
+                    "Emerge has broken packages that need fixing",
+                    "emerge --sync && emerge -u world",
+                    "Fix broken Emerge packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_yay_health(self, command: str) -> List[HealthCheck]:
         """Check Yay health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, '-Q'], capture_output=True, text=True)
+        with self._safe('yay health'):
+            result = _run([command, '-Q'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Yay Broken Packages",
-                    status="error",
-                    message="Yay has broken packages that need fixing",
-                    fix_command="yay -Syu",
-                    fix_description="Fix broken Yay packages"
+                checks.append(_err(
+                    "Yay Broken Packages",
+                    "Yay has broken packages that need fixing",
+                    "yay -Syu",
+                    "Fix broken Yay packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_slackpkg_health(self, command: str) -> List[HealthCheck]:
         """Check Slackpkg health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, 'check-updates'], capture_output=True, text=True)
+        with self._safe('slackpkg health'):
+            result = _run([command, 'check-updates'], timeout=_SYNC_TIMEOUT)
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Slackpkg Broken Packages",
-                    status="error",
-                    message="Slackpkg has broken packages that need fixing",
-                    fix_command="slackpkg update && slackpkg upgrade-all",
-                    fix_description="Fix broken Slackpkg packages"
+                checks.append(_err(
+                    "Slackpkg Broken Packages",
+                    "Slackpkg has broken packages that need fixing",
+                    "slackpkg update && slackpkg upgrade-all",
+                    "Fix broken Slackpkg packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_apk_health(self, command: str) -> List[HealthCheck]:
         """Check APK health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, 'version'], capture_output=True, text=True)
+        with self._safe('apk health'):
+            result = _run([command, 'version'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="APK Broken Packages",
-                    status="error",
-                    message="APK has broken packages that need fixing",
-                    fix_command="apk update && apk upgrade",
-                    fix_description="Fix broken APK packages"
+                checks.append(_err(
+                    "APK Broken Packages",
+                    "APK has broken packages that need fixing",
+                    "apk update && apk upgrade",
+                    "Fix broken APK packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_xbps_health(self, command: str) -> List[HealthCheck]:
         """Check XBPS health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, '-S'], capture_output=True, text=True)
+        with self._safe('xbps health'):
+            result = _run([command, '-S'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="XBPS Broken Packages",
-                    status="error",
-                    message="XBPS has broken packages that need fixing",
-                    fix_command="xbps-install -Su",
-                    fix_description="Fix broken XBPS packages"
+                checks.append(_err(
+                    "XBPS Broken Packages",
+                    "XBPS has broken packages that need fixing",
+                    "xbps-install -Su",
+                    "Fix broken XBPS packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_apx_health(self, command: str) -> List[HealthCheck]:
         """Check APX health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, 'list'], capture_output=True, text=True)
+        with self._safe('apx health'):
+            result = _run([command, 'list'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="APX Broken Packages",
-                    status="error",
-                    message="APX has broken packages that need fixing",
-                    fix_command="apx update",
-                    fix_description="Fix broken APX packages"
+                checks.append(_err(
+                    "APX Broken Packages",
+                    "APX has broken packages that need fixing",
+                    "apx update",
+                    "Fix broken APX packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_nix_health(self, command: str) -> List[HealthCheck]:
         """Check Nix health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, 'store', 'verify'], capture_output=True, text=True)
+        with self._safe('nix health'):
+            result = _run([command, 'store', 'verify'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Nix Broken Store",
-                    status="error",
-                    message="Nix store is corrupted",
-                    fix_command="nix-store --verify --check-contents",
-                    fix_description="Verify and fix Nix store"
+                checks.append(_err(
+                    "Nix Broken Store",
+                    "Nix store is corrupted",
+                    "nix-store --verify --check-contents",
+                    "Verify and fix Nix store"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_slpkg_health(self, command: str) -> List[HealthCheck]:
         """Check Slpkg health"""
         checks = []
         
         # Check for broken packages
-        try:
-            result = subprocess.run([command, 'check'], capture_output=True, text=True)
+        with self._safe('slpkg health'):
+            result = _run([command, 'check'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Slpkg Broken Packages",
-                    status="error",
-                    message="Slpkg has broken packages that need fixing",
-                    fix_command="slpkg update",
-                    fix_description="Fix broken Slpkg packages"
+                checks.append(_err(
+                    "Slpkg Broken Packages",
+                    "Slpkg has broken packages that need fixing",
+                    "slpkg update",
+                    "Fix broken Slpkg packages"
                 ))
-        except Exception:
-            pass
         
         return checks
     
     def check_third_party_repos(self) -> List[HealthCheck]:
         """Check third-party repository health"""
-        checks = []
-        
         # Check for broken repositories across all package managers
-        checks.extend(self._check_dnf_repos())
-        checks.extend(self._check_apt_repos())
-        checks.extend(self._check_pacman_repos())
-        checks.extend(self._check_zypper_repos())
-        checks.extend(self._check_emerge_repos())
-        checks.extend(self._check_flatpak_remotes())
-        
-        return checks
+        return self._run_checks_parallel([
+            self._check_dnf_repos,
+            self._check_apt_repos,
+            self._check_pacman_repos,
+            self._check_zypper_repos,
+            self._check_emerge_repos,
+            self._check_flatpak_remotes,
+        ])
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_dnf_repos(self) -> List[HealthCheck]:
         """Check DNF repositories"""
         checks = []
         
-        try:
-            result = subprocess.run(['dnf', 'repolist'], capture_output=True, text=True)
+        if not _which('dnf'):
+            return checks
+        
+        with self._safe('dnf repos'):
+            result = _run(['dnf', 'repolist'], timeout=_SYNC_TIMEOUT)
+            if result is None:
+                return checks
             if result.returncode == 0:
-                lines = result.stdout.split('\n')
-                for line in lines:
-                    if 'error' in line.lower() or 'failed' in line.lower():
-                        checks.append(HealthCheck(
-                            name="DNF Repository Error",
-                            status="warning",
-                            message=f"Repository error: {line.strip()}",
-                            fix_command="dnf clean all && dnf makecache",
-                            fix_description="Clean and rebuild DNF cache"
-                        ))
-        except Exception:
-            pass
+                for match in _REPO_ERROR_RE.finditer(result.stdout):
+                    checks.append(_warn(
+                        "DNF Repository Error",
+                        f"Repository error: {match.group().strip()}",
+                        "dnf clean all && dnf makecache",
+                        "Clean and rebuild DNF cache"
+                    ))
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_apt_repos(self) -> List[HealthCheck]:
         """Check APT repositories"""
         checks = []
         
-        try:
-            result = subprocess.run(['apt', 'update'], capture_output=True, text=True)
+        if not _which('apt-get'):
+            return checks
+        
+        # Simulated upgrade: parses the sources and cached indexes without
+        # touching the network or /var/lib/apt (unlike `apt update`)
+        with self._safe('apt repos'):
+            result = _run(['apt-get', '-s', 'upgrade'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="APT Repository Error",
-                    status="warning",
-                    message="APT repository update failed",
-                    fix_command="apt update --fix-missing",
-                    fix_description="Fix APT repository issues"
+                checks.append(_warn(
+                    "APT Repository Error",
+                    "APT repository configuration or indexes are broken",
+                    "apt update --fix-missing",
+                    "Fix APT repository issues"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_pacman_repos(self) -> List[HealthCheck]:
         """Check Pacman repositories"""
         checks = []
         
+        if not _which('pacman'):
+            return checks
+        
+        # Inspect the synced databases instead of running `pacman -Sy`,
+        # which downloads them and needs the database lock
         try:
-            result = subprocess.run(['pacman', '-Sy'], capture_output=True, text=True)
-            if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Pacman Repository Error",
-                    status="warning",
-                    message="Pacman repository sync failed",
-                    fix_command="pacman -Syy",
-                    fix_description="Force Pacman repository sync"
-                ))
-        except Exception:
-            pass
+            with os.scandir(_PACMAN_SYNC_DIR) as it:
+                sizes = [entry.stat().st_size for entry in it if entry.name.endswith('.db')]
+        except OSError:
+            sizes = []
+        
+        if not sizes or 0 in sizes:
+            checks.append(_warn(
+                "Pacman Repository Error",
+                "Pacman repository databases are missing or empty",
+                "pacman -Syy",
+                "Force Pacman repository sync"
+            ))
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_zypper_repos(self) -> List[HealthCheck]:
         """Check Zypper repositories"""
         checks = []
         
-        try:
-            result = subprocess.run(['zypper', 'refresh'], capture_output=True, text=True)
+        if not _which('zypper'):
+            return checks
+        
+        with self._safe('zypper repos'):
+            result = _run(['zypper', 'refresh'], timeout=_SYNC_TIMEOUT)
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Zypper Repository Error",
-                    status="warning",
-                    message="Zypper repository refresh failed",
-                    fix_command="zypper refresh --force",
-                    fix_description="Force Zypper repository refresh"
+                checks.append(_warn(
+                    "Zypper Repository Error",
+                    "Zypper repository refresh failed",
+                    "zypper refresh --force",
+                    "Force Zypper repository refresh"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_emerge_repos(self) -> List[HealthCheck]:
         """Check Emerge repositories"""
         checks = []
         
-        try:
-            result = subprocess.run(['emerge', '--sync'], capture_output=True, text=True)
-            if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Emerge Repository Error",
-                    status="warning",
-                    message="Emerge repository sync failed",
-                    fix_command="emerge --sync --quiet",
-                    fix_description="Fix Emerge repository sync"
+        if not _which('emerge') or not _which('portageq'):
+            return checks
+        
+        # Read the repository configuration rather than `emerge --sync`,
+        # which rewrites the whole tree over the network
+        with self._safe('emerge repos'):
+            result = _run(['portageq', 'repos_config', '/'])
+            if result is None:
+                return checks
+            if result.returncode != 0 or not result.stdout.strip():
+                checks.append(_warn(
+                    "Emerge Repository Error",
+                    "Emerge repository configuration is broken",
+                    "emerge --sync --quiet",
+                    "Fix Emerge repository sync"
                 ))
-        except Exception:
-            pass
         
         return checks
     
+    @_cached(ttl=_PROBE_TTL)
     def _check_flatpak_remotes(self) -> List[HealthCheck]:
         """Check Flatpak remotes"""
         checks = []
         
-        try:
-            result = subprocess.run(['flatpak', 'remotes'], capture_output=True, text=True)
+        if not _which('flatpak'):
+            return checks
+        
+        with self._safe('flatpak remotes'):
+            result = _run(['flatpak', 'remotes'])
+            if result is None:
+                return checks
             if result.returncode != 0:
-                checks.append(HealthCheck(
-                    name="Flatpak Remote Error",
-                    status="warning",
-                    message="Flatpak remote configuration error",
-                    fix_command="flatpak repair",
-                    fix_description="Repair Flatpak remotes"
+                checks.append(_warn(
+                    "Flatpak Remote Error",
+                    "Flatpak remote configuration error",
+                    "flatpak repair",
+                    "Repair Flatpak remotes"
                 ))
-        except Exception:
-            pass
         
         return checks
     
@@ -598,49 +809,14 @@ class HealthCheckers:
         checks = []
         
         # Check for large package manager caches
-        cache_dirs = [
-            ('/var/cache/apt', 'apt'),
-            ('/var/cache/dnf', 'dnf'),
-            ('/var/cache/pacman', 'pacman'),
-            ('/var/cache/zypper', 'zypper'),
-            ('/var/cache/flatpak', 'flatpak'),
-            ('/var/cache/apk', 'apk'),
-            ('/var/cache/xbps', 'xbps'),
-            ('/var/cache/emerge', 'emerge'),
-            ('/var/cache/slackpkg', 'slackpkg'),
-            ('/var/cache/nix', 'nix')
-        ]
-        
-        for cache_dir, manager in cache_dirs:
-            if Path(cache_dir).exists():
-                try:
-                    result = subprocess.run(['du', '-sh', cache_dir], 
-                                          capture_output=True, text=True)
-                    if result.returncode == 0:
-                        size_str = result.stdout.split()[0]
-                        # Extract size in MB/GB
-                        if 'G' in size_str:
-                            size_gb = float(size_str.replace('G', ''))
-                            if size_gb > 5:  # More than 5GB
-                                checks.append(HealthCheck(
-                                    name=f"Large {manager} Cache",
-                                    status="warning",
-                                    message=f"{manager} cache is {size_str}",
-                                    fix_command=f"{manager} clean all",
-                                    fix_description=f"Clean large {manager} cache"
-                                ))
-                        elif 'M' in size_str:
-                            size_mb = float(size_str.replace('M', ''))
-                            if size_mb > 1000:  # More than 1GB
-                                checks.append(HealthCheck(
-                                    name=f"Large {manager} Cache",
-                                    status="warning",
-                                    message=f"{manager} cache is {size_str}",
-                                    fix_command=f"{manager} clean all",
-                                    fix_description=f"Clean large {manager} cache"
-                                ))
-                except Exception:
-                    pass
+        for manager, size in self._scan_cache_sizes().items():
+            if size > 1024 ** 3:  # More than 1GB
+                checks.append(_warn(
+                    f"Large {manager} Cache",
+                    f"{manager} cache is {_humanize(size)}",
+                    f"{manager} clean all",
+                    f"Clean large {manager} cache"
+                ))
         
         return checks
     
@@ -649,54 +825,42 @@ class HealthCheckers:
         checks = []
         
         # Check for interrupted installations
-        partial_dirs = [
-            '/var/lib/dnf/transaction',
-            '/var/lib/apt/lists/partial',
-            '/var/lib/pacman/db.lck'
-        ]
-        
-        for partial_dir in partial_dirs:
-            if Path(partial_dir).exists():
-                try:
-                    files = list(Path(partial_dir).glob('*'))
-                    if files:
-                        checks.append(HealthCheck(
-                            name="Partial Installation Files",
-                            status="error",
-                            message=f"Found partial installation files in {partial_dir}",
-                            fix_command=f"rm -rf {partial_dir}/*",
-                            fix_description="Clean partial installation files"
+        for partial_dir, _ in _PARTIAL_DIRS:
+            if self._stat(partial_dir) is not None:
+                with self._safe('partial installations'):
+                    if _has_entries(partial_dir):
+                        checks.append(_err(
+                            "Partial Installation Files",
+                            f"Found partial installation files in {partial_dir}",
+                            f"rm -rf {partial_dir}/*",
+                            "Clean partial installation files"
                         ))
-                except Exception:
-                    pass
         
         return checks
     
     def check_purge_history(self) -> List[HealthCheck]:
         """Check purge history and orphaned packages"""
+        # Check for orphaned packages in different package managers
+        return self._run_checks_parallel([
+            partial(self._check_orphans, manager, command, description)
+            for manager, command, description in _ORPHAN_CHECKS
+            if _which(manager)
+        ])
+    
+    def _check_orphans(self, manager: str, command: str, description: str) -> List[HealthCheck]:
+        """Check one package manager for orphaned packages"""
         checks = []
         
-        # Check for orphaned packages in different package managers
-        orphan_checks = [
-            ('dnf', 'dnf autoremove --dry-run', 'DNF orphaned packages'),
-            ('apt', 'apt autoremove --dry-run', 'APT orphaned packages'),
-            ('pacman', 'pacman -Qdt', 'Pacman orphaned packages'),
-            ('zypper', 'zypper packages --orphaned', 'Zypper orphaned packages')
-        ]
-        
-        for manager, command, description in orphan_checks:
-            if shutil.which(manager):
-                try:
-                    result = subprocess.run(command.split(), capture_output=True, text=True)
-                    if result.returncode == 0 and result.stdout.strip():
-                        checks.append(HealthCheck(
-                            name=description,
-                            status="warning",
-                            message=f"Found orphaned packages for {manager}",
-                            fix_command=f"{manager} autoremove",
-                            fix_description=f"Remove orphaned {manager} packages"
-                        ))
-                except Exception:
-                    pass
+        with self._safe(f'{manager} orphans'):
+            result = _run(command.split())
+            if result is None:
+                return checks
+            if result.returncode == 0 and result.stdout.strip():
+                checks.append(_warn(
+                    description,
+                    f"Found orphaned packages for {manager}",
+                    f"{manager} autoremove",
+                    f"Remove orphaned {manager} packages"
+                ))
         
         return checks 
\ No newline at end of file
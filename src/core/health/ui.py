@@ -5,20 +5,87 @@ Health UI Module
 Handles the user interface for health checks and fixes.
 """
 
+import re
+import shlex
+import sys
 import subprocess
+import time
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
 from .base import HealthCheck
 from ..plugin_manager import PluginEvent
 
 
+_STATUS_ICONS = {'error': '🔴', 'warning': '🟡'}
+
+# A category shows the icon of its worst check
+_STATUS_RANK = {'warning': 1, 'error': 2}
+_RANK_ICONS = ('🟢', '🟡', '🔴')
+
+# One issue in a listing; entries are newline-joined, leaving a blank line between
+_ISSUE_FMT = "%d. %s %s\n   %s\n"
+_ISSUE_FIX_FMT = "%d. %s %s\n   %s\n   Fix: %s\n"
+
+# Menus are written whole, with their prompt, on every pass
+_OVERVIEW_MENU = (
+    "Options:\n"
+    "1. View all issues\n"
+    "2. View by category\n"
+    "3. Fix all issues\n"
+    "4. Exit\n"
+    "Enter your choice (1-4): "
+)
+_CATEGORY_MENU = (
+    "Options:\n"
+    "1. Fix all issues in this category\n"
+    "2. Fix individual issues\n"
+    "3. Back to categories\n"
+    "Enter your choice (1-3): "
+)
+
+# Operators and globs that only a shell understands
+_SHELL_SYNTAX = re.compile(r'[&|;<>*?$`]')
+
+# Seconds during which rerunning an identical, successful fix command is skipped
+_FIX_REUSE_WINDOW = 60.0
+
+# Fix command prefixes whose trailing arguments can be merged into one run
+_COALESCE = frozenset((
+    ('rm', '-f'),
+))
+
+# Category keywords matched against check names, first match wins
+_CATEGORY_PATTERNS = tuple((re.compile(pattern, re.IGNORECASE), category) for pattern, category in (
+    (r'cache', 'Package Caches'),
+    (r'lock|partial', 'System Locks'),
+    (r'broken|corrupted', 'Package Manager Issues'),
+    (r'repo', 'Repository Issues'),
+    (r'disk|bloat', 'Disk Usage'),
+    (r'orphaned|purge', 'Package Cleanup'),
+))
+
+
+def _fix_argv(command: str) -> List[str]:
+    """Argument vector for a fix command.
+    
+    Fix commands are plain command lines, but some chain steps with && or
+    clean directories with a glob; those need a shell to mean anything.
+    """
+    if _SHELL_SYNTAX.search(command):
+        return ['/bin/sh', '-c', command]
+    return shlex.split(command)
+
+
 class HealthUI:
     """Handles health check user interface"""
     
     def __init__(self):
         """Initialize health UI"""
         self.logger = logging.getLogger(__name__)
+        self._category_icons: Dict[str, str] = {}
+        self._pre_health_fired = False
+        self._ran_commands: Dict[Tuple[str, ...], float] = {}
     
     def display_header(self, message: str):
         """Display health check header"""
@@ -38,149 +105,169 @@ class HealthUI:
         # Group checks by category
         grouped_checks = self._group_checks_by_category(checks)
         
-        print("📊 Health Check Overview")
-        print("=" * 30)
-        
         # Show summary by category
+        lines = ["📊 Health Check Overview", "=" * 30]
         for category, category_checks in grouped_checks.items():
-            icon = self._get_category_status_icon(category_checks)
-            print(f"{icon} {category}: {len(category_checks)} issues")
-        
-        print()
+            lines.append(f"{self._category_icons[category]} {category}: {len(category_checks)} issues")
+        lines.append("")
+        self._write_lines(lines)
         
-        # Show detailed view
+        # Show detailed view; choices 3 and 4 end the overview
+        actions = {
+            '1': lambda: self._show_all_issues(checks),
+            '2': lambda: self._show_by_category(grouped_checks, checks, engine),
+            '3': lambda: self.fix_all_issues(checks, engine),
+            '4': lambda: 0,
+        }
         while True:
-            print("Options:")
-            print("1. View all issues")
-            print("2. View by category")
-            print("3. Fix all issues")
-            print("4. Exit")
-            
-            choice = input("Enter your choice (1-4): ").strip()
-            
-            if choice == '1':
-                self._show_all_issues(checks)
-            elif choice == '2':
-                self._show_by_category(grouped_checks, checks, engine)
-            elif choice == '3':
-                return self.fix_all_issues(checks, engine)
-            elif choice == '4':
-                return 0
-            else:
+            self._pre_health_fired = False
+            choice = self._prompt(_OVERVIEW_MENU)
+            action = actions.get(choice)
+            if action is None:
                 print("Invalid choice")
+                continue
+            result = action()
+            if choice in ('3', '4'):
+                return result
     
     def _show_all_issues(self, checks: List[HealthCheck]):
         """Show all health issues"""
-        print("\nAll Health Issues:")
-        print("=" * 20)
-        
-        for i, check in enumerate(checks, 1):
-            status_icon = self._get_status_icon(check.status)
-            print(f"{i}. {status_icon} {check.name}")
-            print(f"   {check.message}")
-            if check.fix_description:
-                print(f"   Fix: {check.fix_description}")
-            print()
+        self._write_lines(["\nAll Health Issues:", "=" * 20, *self._issue_lines(checks)])
     
     def _show_by_category(self, grouped_checks: Dict[str, List[HealthCheck]], all_checks: List[HealthCheck], engine=None):
         """Show issues by category"""
-        print("\nCategories:")
         categories = list(grouped_checks.keys())
+        lines = ["\nCategories:"]
         for i, category in enumerate(categories, 1):
-            icon = self._get_category_status_icon(grouped_checks[category])
-            print(f"{i}. {icon} {category}")
+            lines.append(f"{i}. {self._category_icons[category]} {category}")
+        self._write_lines(lines)
         
-        choice = input("Enter category number: ").strip()
-        try:
-            idx = int(choice) - 1
-            if 0 <= idx < len(categories):
-                category = categories[idx]
-                return self._show_category_details(category, grouped_checks[category], all_checks, engine)
-            else:
-                print("Invalid category number")
-        except ValueError:
+        choice = self._prompt("Enter category number: ")
+        if not choice.isdecimal():
             print("Invalid input")
+            return
+        idx = int(choice) - 1
+        if 0 <= idx < len(categories):
+            category = categories[idx]
+            return self._show_category_details(category, grouped_checks[category], all_checks, engine)
+        else:
+            print("Invalid category number")
     
     def _show_category_details(self, category: str, category_checks: List[HealthCheck], all_checks: List[HealthCheck], engine=None) -> int:
         """Show details for a specific category"""
-        print(f"\n{category} Issues:")
-        print("=" * (len(category) + 8))
-        
-        for i, check in enumerate(category_checks, 1):
-            status_icon = self._get_status_icon(check.status)
-            print(f"{i}. {status_icon} {check.name}")
-            print(f"   {check.message}")
-            if check.fix_description:
-                print(f"   Fix: {check.fix_description}")
-            print()
-        
-        print("Options:")
-        print("1. Fix all issues in this category")
-        print("2. Fix individual issues")
-        print("3. Back to categories")
-        
-        choice = input("Enter your choice (1-3): ").strip()
+        self._write_lines([
+            f"\n{category} Issues:",
+            "=" * (len(category) + 8),
+            *self._issue_lines(category_checks),
+        ])
         
-        if choice == '1':
-            return self._fix_category_issues(category_checks, engine)
-        elif choice == '2':
-            return self._fix_individual_issues(category_checks, engine)
-        elif choice == '3':
-            return 0
-        else:
+        actions = {
+            '1': lambda: self._fix_category_issues(category_checks, engine),
+            '2': lambda: self._fix_individual_issues(category_checks, engine),
+            '3': lambda: 0,
+        }
+        action = actions.get(self._prompt(_CATEGORY_MENU))
+        if action is None:
             print("Invalid choice")
             return 0
+        return action()
     
-    def _fix_category_issues(self, checks: List[HealthCheck], engine=None) -> int:
-        """Fix all issues in a category"""
-        # Trigger pre-health event before applying fixes
-        if engine:
+    def _prompt(self, text: str) -> str:
+        """Show a prompt and read one stripped line; raises EOFError like input()"""
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.strip()
+    
+    def _trigger_pre_health(self, engine, checks: List[HealthCheck], fix_count: int,
+                            options: Optional[Dict[str, Any]] = None):
+        """Emit PRE_HEALTH before fixes, at most once per user action"""
+        if not engine or self._pre_health_fired:
+            return
+        self._pre_health_fired = True
+        if engine.plugin_manager.has_handlers(PluginEvent.PRE_HEALTH):
             health_context = {
                 'checks': checks,
-                'fix_count': len([c for c in checks if c.fix_command]),
-                'options': {}
+                'fix_count': fix_count,
+                'options': options or {}
             }
             engine._trigger_plugin_event(PluginEvent.PRE_HEALTH, health_context)
+    
+    def _write_lines(self, lines: List[str]):
+        """Print several lines with a single write"""
+        sys.stdout.write('\n'.join(lines) + '\n')
+    
+    def _issue_lines(self, checks: List[HealthCheck]) -> List[str]:
+        """Numbered listing of checks with their messages and fixes, one entry per check"""
+        status_icon = self._get_status_icon
+        rows = [(status_icon(c.status), c.name, c.message, c.fix_description) for c in checks]
+        return [
+            _ISSUE_FIX_FMT % (i, icon, name, message, fix) if fix else _ISSUE_FMT % (i, icon, name, message)
+            for i, (icon, name, message, fix) in enumerate(rows, 1)
+        ]
+    
+    def _fix_category_issues(self, checks: List[HealthCheck], engine=None) -> int:
+        """Fix all issues in a category"""
+        # Trigger pre-health event before applying fixes
+        self._trigger_pre_health(engine, checks, sum(1 for c in checks if c.fix_command))
         
         print(f"Fixing {len(checks)} issues...")
         
+        # Confirm every fix first, then run the accepted ones as one group so
+        # same-prefix fixes (e.g. several lock removals) share a process
+        confirmed = [check for check in checks if self._confirm_fix(check)]
+        
         success_count = 0
-        for check in checks:
-            if self._fix_single_issue(check):
-                success_count += 1
+        for check, error in self._run_fix_group(confirmed):
+            success_count += self._report_fix(check, error)
         
         print(f"Fixed {success_count}/{len(checks)} issues")
         return 0
     
     def _fix_individual_issues(self, checks: List[HealthCheck], engine=None) -> int:
         """Fix individual issues"""
-        print("\nSelect issues to fix:")
-        for i, check in enumerate(checks, 1):
-            status_icon = self._get_status_icon(check.status)
-            print(f"{i}. {status_icon} {check.name}")
+        status_icon = self._get_status_icon
+        lines = ["\nSelect issues to fix:"]
+        lines.extend(f"{i}. {status_icon(check.status)} {check.name}" for i, check in enumerate(checks, 1))
+        self._write_lines(lines)
         
-        choice = input("Enter issue number (or 'all'): ").strip()
+        choice = self._prompt("Enter issue number (or 'all'): ")
         
         if choice.lower() == 'all':
             return self._fix_category_issues(checks, engine)
         
-        try:
-            idx = int(choice) - 1
-            if 0 <= idx < len(checks):
-                check = checks[idx]
-                if self._fix_single_issue(check):
-                    print("Issue fixed successfully")
-                else:
-                    print("Failed to fix issue")
-            else:
-                print("Invalid issue number")
-        except ValueError:
+        if not choice.isdecimal():
             print("Invalid input")
+            return 0
+        
+        idx = int(choice) - 1
+        if 0 <= idx < len(checks):
+            check = checks[idx]
+            if self._fix_single_issue(check):
+                print("Issue fixed successfully")
+            else:
+                print("Failed to fix issue")
+        else:
+            print("Invalid issue number")
         
         return 0
     
     def _fix_single_issue(self, check: HealthCheck) -> bool:
         """Fix a single health issue"""
+        if not self._confirm_fix(check):
+            return False
+        
+        error = self._run_fix(check)
+        if error is None:
+            print("✅ Fixed successfully")
+            return True
+        print(f"❌ Fix {error[:1].lower()}{error[1:]}")
+        return False
+    
+    def _confirm_fix(self, check: HealthCheck) -> bool:
+        """Show a fix and ask whether to run it; a fix that just succeeded needs no asking"""
         if not check.fix_command:
             print(f"No fix available for: {check.name}")
             return False
@@ -188,37 +275,91 @@ class HealthUI:
         print(f"Fixing: {check.name}")
         print(f"Command: {check.fix_command}")
         
-        confirm = input("Proceed? (y/N): ").strip().lower()
+        if self._recent_fix(_fix_argv(check.fix_command)):
+            return True
+        
+        confirm = self._prompt("Proceed? (y/N): ").lower()
         if confirm != 'y':
             print("Skipped")
             return False
+        return True
+    
+    def _run_fix(self, check: HealthCheck) -> Optional[str]:
+        """Run a check's fix command without prompting; None on success, else the error"""
+        return self._run_fix_argv(_fix_argv(check.fix_command))
+    
+    def _run_fix_argv(self, argv: List[str]) -> Optional[str]:
+        """Run a fix command line; None on success, else the error.
+        
+        A command that succeeded within _FIX_REUSE_WINDOW isn't run again;
+        failed commands are always retried.
+        """
+        if self._recent_fix(argv):
+            print(f"♻️  Already applied: {' '.join(argv)}")
+            return None
         
         try:
-            result = subprocess.run(check.fix_command.split(), 
-                                  capture_output=True, text=True, timeout=300)
-            if result.returncode == 0:
-                print("✅ Fixed successfully")
-                return True
-            else:
-                print(f"❌ Fix failed: {result.stderr}")
-                return False
+            result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                    text=True, timeout=300)
+            error = None if result.returncode == 0 else f"Failed: {result.stderr.strip()}"
         except subprocess.TimeoutExpired:
-            print("❌ Fix timed out")
-            return False
+            error = "Timed out"
         except Exception as e:
-            print(f"❌ Fix error: {e}")
-            return False
+            error = f"Error: {e}"
+        if error is None:
+            self._ran_commands[tuple(argv)] = time.monotonic()
+        return error
+    
+    def _recent_fix(self, argv: List[str]) -> bool:
+        """Whether this command succeeded within _FIX_REUSE_WINDOW"""
+        ran = self._ran_commands.get(tuple(argv))
+        return ran is not None and time.monotonic() - ran < _FIX_REUSE_WINDOW
     
-    def fix_all_issues(self, checks: List[HealthCheck], engine=None) -> int:
-        """Fix all health issues automatically"""
+    def _run_fix_group(self, group: List[HealthCheck]) -> List[Tuple[HealthCheck, Optional[str]]]:
+        """Run fixes one after another, merging coalescable ones.
+        
+        Fixes sharing a _COALESCE prefix (e.g. several `rm -f <lock>`) run as
+        one command, when the first of them comes up, and share its outcome.
+        Outcomes are returned in the order of group.
+        """
+        argvs = [_fix_argv(check.fix_command) for check in group]
+        batches: Dict[Tuple[str, ...], List[int]] = {}
+        for i, argv in enumerate(argvs):
+            if len(argv) > 2 and tuple(argv[:2]) in _COALESCE:
+                batches.setdefault(tuple(argv[:2]), []).append(i)
+        
+        errors: Dict[int, Optional[str]] = {}
+        for i in range(len(group)):
+            if i in errors:
+                continue
+            batch = batches.get(tuple(argvs[i][:2]), [])
+            if i not in batch:
+                batch = [i]
+            argv = list(argvs[i][:2]) + [arg for j in batch for arg in argvs[j][2:]]
+            error = self._run_fix_argv(argv)
+            for j in batch:
+                errors[j] = error
+        return [(check, errors[i]) for i, check in enumerate(group)]
+    
+    def _report_fix(self, check: HealthCheck, error: Optional[str]) -> bool:
+        """Print the outcome of a fix run by _run_fix; True if it succeeded"""
+        if error is None:
+            print(f"✅ {check.name} - Fixed")
+            return True
+        print(f"❌ {check.name} - {error}")
+        return False
+    
+    def fix_all_issues(self, checks: List[HealthCheck], engine=None, options: Optional[Dict[str, Any]] = None) -> int:
+        """Fix all health issues automatically.
+        
+        This is the only place the fix-all paths (--fix-all and menu choice 3)
+        emit PRE_HEALTH, so callers must not trigger it themselves.
+        """
+        fixable = [c for c in checks if c.fix_command]
+        unfixable = [c for c in checks if not c.fix_command]
+        
         # Trigger pre-health event before applying fixes
-        if engine:
-            health_context = {
-                'checks': checks,
-                'fix_count': len([c for c in checks if c.fix_command]),
-                'options': {}
-            }
-            engine._trigger_plugin_event(PluginEvent.PRE_HEALTH, health_context)
+        self._trigger_pre_health(engine, checks, len(fixable), options)
         
         print("🔧 Fixing all health issues...")
         print()
@@ -226,24 +367,13 @@ class HealthUI:
         success_count = 0
         total_count = len(checks)
         
-        for check in checks:
-            if not check.fix_command:
-                print(f"⚠️  No fix available for: {check.name}")
-                continue
-            
-            print(f"Fixing: {check.name}")
-            try:
-                result = subprocess.run(check.fix_command.split(), 
-                                      capture_output=True, text=True, timeout=300)
-                if result.returncode == 0:
-                    print(f"✅ {check.name} - Fixed")
-                    success_count += 1
-                else:
-                    print(f"❌ {check.name} - Failed: {result.stderr.strip()}")
-            except subprocess.TimeoutExpired:
-                print(f"❌ {check.name} - Timed out")
-            except Exception as e:
-                print(f"❌ {check.name} - Error: {e}")
+        # Fixes run one at a time: lock removals and package manager commands
+        # touch the same databases, and fixes may prompt on the terminal
+        if unfixable:
+            self._write_lines([f"⚠️  No fix available for: {check.name}" for check in unfixable])
+        self._write_lines([f"Fixing: {check.name}" for check in fixable])
+        for check, error in self._run_fix_group(fixable):
+            success_count += self._report_fix(check, error)
         
         print()
         print(f"📊 Results: {success_count}/{total_count} issues fixed")
@@ -258,48 +388,30 @@ class HealthUI:
         return 0
     
     def _group_checks_by_category(self, checks: List[HealthCheck]) -> Dict[str, List[HealthCheck]]:
-        """Group health checks by category"""
+        """Group health checks by category, caching each category's status icon"""
         grouped = {}
+        worst: Dict[str, int] = {}
         for check in checks:
             category = self._get_check_category(check)
             if category not in grouped:
                 grouped[category] = []
+                worst[category] = 0
             grouped[category].append(check)
+            rank = _STATUS_RANK.get(check.status, 0)
+            if rank > worst[category]:
+                worst[category] = rank
+        
+        # Checks don't change while the menus are up, so the icons are final
+        self._category_icons = {category: _RANK_ICONS[rank] for category, rank in worst.items()}
         return grouped
     
     def _get_check_category(self, check: HealthCheck) -> str:
         """Get category for a health check"""
-        name = check.name.lower()
-        
-        if 'cache' in name:
-            return 'Package Caches'
-        elif 'lock' in name or 'partial' in name:
-            return 'System Locks'
-        elif 'broken' in name or 'corrupted' in name:
-            return 'Package Manager Issues'
-        elif 'repository' in name or 'repo' in name:
-            return 'Repository Issues'
-        elif 'disk' in name or 'bloat' in name:
-            return 'Disk Usage'
-        elif 'orphaned' in name or 'purge' in name:
-            return 'Package Cleanup'
-        else:
-            return 'Other Issues'
-    
-    def _get_category_status_icon(self, checks: List[HealthCheck]) -> str:
-        """Get status icon for a category"""
-        if any(check.status == 'error' for check in checks):
-            return '🔴'
-        elif any(check.status == 'warning' for check in checks):
-            return '🟡'
-        else:
-            return '🟢'
+        for pattern, category in _CATEGORY_PATTERNS:
+            if pattern.search(check.name):
+                return category
+        return 'Other Issues'
     
     def _get_status_icon(self, status: str) -> str:
         """Get status icon for a check"""
-        if status == 'error':
-            return '🔴'
-        elif status == 'warning':
-            return '🟡'
-        else:
-            return '🟢' 
\ No newline at end of file
+        return _STATUS_ICONS.get(status, '🟢') 
\ No newline at end of file
@@ -7,15 +7,45 @@ Tracks package installations and provides rollback capabilities.
 
 import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, NamedTuple
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 import shutil
 
 from .config import ConfigManager
-from .directories import DirectoryManager
+from .directories import get_directory_manager
 from .privilege import PrivilegeManager
 
+# orjson encodes and parses history several times faster when it's installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize history data to JSON bytes, two-space indented if requested"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes from a history file"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Concurrent package manager queries during reconcile_package_status
+_RECONCILE_WORKERS = 8
+
+# Journal length below which it is never compacted into the history file
+_JOURNAL_COMPACT_MIN = 100
+
 
 class InstallationRecord(NamedTuple):
     """Record of a package installation"""
@@ -35,32 +65,120 @@ class HistoryManager:
     def __init__(self, config_manager: ConfigManager):
         """Initialize history manager"""
         self.config_manager = config_manager
-        self.directory_manager = DirectoryManager()
+        self.directory_manager = get_directory_manager()
         self.privilege_manager = PrivilegeManager()
         self.logger = logging.getLogger(__name__)
         
+        # Per-scope lookup tables over installations, built on first use
+        self._indexes: Dict[str, Dict[str, Dict[Any, List[int]]]] = {}
+        
+        self._registry = None
+        
+        # Last journal sequence number applied, and journal length, per scope
+        self._journal_seq: Dict[str, int] = {}
+        self._journal_lines: Dict[str, int] = {}
+        
         # Load both user and system history
         self.user_history_data = self._load_history('user')
         self.system_history_data = self._load_history('system')
     
+    def _get_index(self, scope: str, history_data: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[Any, List[int]]]:
+        """Lookup tables mapping keys to installation ids for a scope.
+        
+        'packages', 'managers' and 'dependencies' are keyed by lowercased name
+        for searching; 'installed' is keyed by exact (manager, package).
+        history_data is passed while the scope is still being loaded.
+        """
+        index = self._indexes.get(scope)
+        if index is None:
+            index = {'packages': {}, 'managers': {}, 'dependencies': {}, 'installed': {}}
+            if history_data is None:
+                history_data = self.system_history_data if scope == 'system' else self.user_history_data
+            for installation_id, installation in enumerate(history_data['installations']):
+                self._index_installation(index, installation_id, installation)
+            self._indexes[scope] = index
+        return index
+    
+    def _index_installation(self, index: Dict[str, Dict[Any, List[int]]], installation_id: int, installation: Dict[str, Any]):
+        """Add one installation to a scope's lookup tables"""
+        def post(table, key):
+            ids = table.setdefault(key, [])
+            if not ids or ids[-1] != installation_id:
+                ids.append(installation_id)
+        
+        manager = installation['manager']
+        post(index['managers'], manager.lower())
+        for package in installation['packages']:
+            post(index['packages'], package.lower())
+            post(index['installed'], (manager, package))
+        for dependency in installation['dependencies']:
+            post(index['dependencies'], dependency.lower())
+    
+    def _journal_file(self, scope: str) -> Path:
+        """Append-only log of history changes made since the last full save"""
+        return self.directory_manager.get_history_file(scope).with_suffix('.jsonl')
+    
     def _load_history(self, scope: str) -> Dict[str, Any]:
-        """Load history data from file for specified scope"""
+        """Load history data from file for specified scope, replaying its journal"""
+        history_data = self._read_snapshot(scope)
+        seq = history_data['metadata'].get('journal_seq', 0)
+        lines = 0
+        
+        journal_file = self._journal_file(scope)
+        if journal_file.exists():
+            try:
+                with open(journal_file, 'rb') as f:
+                    data = f.read()
+            except IOError as e:
+                self.logger.warning(f"Failed to replay {scope} history journal: {e}")
+                data = b''
+            
+            # An interrupted append leaves a partial last line; cut it off so
+            # the next append starts on a line of its own
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                self.logger.warning(f"Discarding incomplete last entry of {scope} history journal")
+                try:
+                    os.truncate(journal_file, end)
+                except OSError as e:
+                    self.logger.warning(f"Failed to truncate {scope} history journal: {e}")
+            
+            for line in data[:end].splitlines():
+                try:
+                    event = _loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(event, dict) or not isinstance(event.get('seq'), int):
+                    continue
+                lines += 1
+                # Events already folded into the snapshot are skipped
+                if event['seq'] > seq:
+                    self._apply_event(scope, history_data, event)
+                    seq = event['seq']
+        
+        self._journal_seq[scope] = seq
+        self._journal_lines[scope] = lines
+        return history_data
+    
+    def _read_snapshot(self, scope: str) -> Dict[str, Any]:
+        """Read the full history file for a scope"""
         history_file = self.directory_manager.get_history_file(scope)
         
         if history_file.exists():
             try:
-                with open(history_file, 'r') as f:
-                    return json.load(f)
+                with open(history_file, 'rb') as f:
+                    return _loads(f.read())
             except (json.JSONDecodeError, IOError) as e:
                 self.logger.warning(f"Failed to load {scope} history data: {e}")
         
         # Return default history structure
+        now = datetime.now().isoformat()
         return {
             'installations': [],
             'rollbacks': [],
             'metadata': {
-                'created': datetime.now().isoformat(),
-                'last_updated': datetime.now().isoformat(),
+                'created': now,
+                'last_updated': now,
                 'total_installations': 0,
                 'total_rollbacks': 0,
                 'scope': scope
@@ -68,16 +186,93 @@ class HistoryManager:
         }
     
     def _save_history(self, scope: str):
-        """Save history data to file for specified scope"""
+        """Save history data to file for specified scope, folding in the journal"""
         history_file = self.directory_manager.get_history_file(scope)
         history_data = self.user_history_data if scope == 'user' else self.system_history_data
+        history_data['metadata']['journal_seq'] = self._journal_seq.get(scope, 0)
         
+        # Write beside the file and rename over it, so a crash mid-write
+        # never leaves a truncated history behind
+        temp_file = history_file.with_name(history_file.name + '.tmp')
         try:
             history_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(history_file, 'w') as f:
-                json.dump(history_data, f, indent=2)
+            with open(temp_file, 'wb') as f:
+                f.write(_dumps(history_data, indent=True))
+                # On disk before the rename, since the journal goes next
+                f.flush()
+                os.fsync(f.fileno())
+            temp_file.replace(history_file)
         except IOError as e:
             self.logger.error(f"Failed to save {scope} history data: {e}")
+            return
+        
+        # Everything in the journal is now in the snapshot
+        try:
+            self._journal_file(scope).unlink()
+        except FileNotFoundError:
+            pass
+        except IOError as e:
+            self.logger.warning(f"Failed to remove {scope} history journal: {e}")
+        self._journal_lines[scope] = 0
+    
+    def _append_event(self, scope: str, event: Dict[str, Any]):
+        """Apply a change to in-memory history and append it to the journal.
+        
+        Each change costs one line instead of a rewrite of the whole history;
+        the journal is compacted into the history file once it holds more
+        than twice as many lines as there are installations.
+        """
+        history_data = self.system_history_data if scope == 'system' else self.user_history_data
+        event['seq'] = self._journal_seq.get(scope, 0) + 1
+        self._apply_event(scope, history_data, event)
+        self._journal_seq[scope] = event['seq']
+        
+        journal_file = self._journal_file(scope)
+        try:
+            journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(journal_file, 'ab') as f:
+                f.write(_dumps(event) + b'\n')
+        except IOError as e:
+            self.logger.error(f"Failed to append to {scope} history journal: {e}")
+            self._save_history(scope)
+            return
+        
+        self._journal_lines[scope] = self._journal_lines.get(scope, 0) + 1
+        if self._journal_lines[scope] > max(_JOURNAL_COMPACT_MIN, 2 * len(history_data['installations'])):
+            self._save_history(scope)
+    
+    def _apply_event(self, scope: str, history_data: Dict[str, Any], event: Dict[str, Any]):
+        """Apply one journal event to a scope's history data"""
+        op = event['op']
+        metadata = history_data['metadata']
+        
+        if op == 'install':
+            installation = event['installation']
+            index = self._indexes.get(scope)
+            if index is not None:
+                self._index_installation(index, len(history_data['installations']), installation)
+            history_data['installations'].append(installation)
+            metadata['total_installations'] += 1
+            metadata['last_updated'] = installation['timestamp']
+        
+        elif op == 'remove':
+            installations = history_data['installations']
+            installed = self._get_index(scope, history_data)['installed']
+            
+            # Find installations that contain any of the specified packages
+            for package in event['packages']:
+                for installation_id in installed.get((event['manager'], package), ()):
+                    # Mark this installation as removed
+                    installation = installations[installation_id]
+                    installation['removed'] = True
+                    installation['removed_timestamp'] = event['timestamp']
+                    installation['removed_packages'] = installation.get('removed_packages', []) + [package]
+        
+        elif op == 'rollback':
+            rollback_record = event['rollback']
+            history_data['rollbacks'].append(rollback_record)
+            metadata['total_rollbacks'] += 1
+            metadata['last_updated'] = rollback_record['timestamp']
     
     def record_install(self, manager: str, packages: List[str], details: Dict[str, Any], scope: str = 'user'):
         """Record a package installation"""
@@ -96,47 +291,31 @@ class HistoryManager:
         )
         
         # Add to appropriate history
-        if scope == 'system':
-            self.system_history_data['installations'].append(record._asdict())
-            self.system_history_data['metadata']['total_installations'] += 1
-            self.system_history_data['metadata']['last_updated'] = datetime.now().isoformat()
-            self._save_history('system')
-        else:
-            self.user_history_data['installations'].append(record._asdict())
-            self.user_history_data['metadata']['total_installations'] += 1
-            self.user_history_data['metadata']['last_updated'] = datetime.now().isoformat()
-            self._save_history('user')
+        self._append_event(scope, {'op': 'install', 'installation': record._asdict()})
         
         self.logger.info(f"Recorded {scope} installation: {manager} - {', '.join(packages)}")
     
     def mark_packages_removed(self, manager: str, packages: List[str], scope: str = 'user'):
         """Mark packages as removed in history"""
-        history_data = self.system_history_data if scope == 'system' else self.user_history_data
-        installations = history_data['installations']
-        
-        # Find installations that contain any of the specified packages
-        for installation in installations:
-            if installation['manager'] == manager:
-                # Check if any of the packages in this installation match our removal list
-                for package in packages:
-                    if package in installation['packages']:
-                        # Mark this installation as removed
-                        installation['removed'] = True
-                        installation['removed_timestamp'] = datetime.now().isoformat()
-                        installation['removed_packages'] = installation.get('removed_packages', []) + [package]
-        
-        # Save the updated history
-        self._save_history(scope)
+        self._append_event(scope, {
+            'op': 'remove',
+            'manager': manager,
+            'packages': list(packages),
+            'timestamp': datetime.now().isoformat()
+        })
         self.logger.info(f"Marked packages as removed in {scope} history: {manager} - {', '.join(packages)}")
     
+    def _get_registry(self):
+        """Package manager registry, created on first use and then reused"""
+        if self._registry is None:
+            from .package_managers import PackageManagerRegistry
+            self._registry = PackageManagerRegistry(self.config_manager)
+        return self._registry
+    
     def check_package_status(self, package_name: str, manager: str, scope: str = 'user') -> Dict[str, Any]:
         """Check if a package is still installed by querying the package manager"""
-        from .package_managers import PackageManagerRegistry
-        
         # Get the package manager instance
-        config_manager = self.config_manager
-        registry = PackageManagerRegistry(config_manager)
-        manager_instance = registry.get_manager(manager)
+        manager_instance = self._get_registry().get_manager(manager)
         
         if not manager_instance:
             return {
@@ -149,22 +328,14 @@ class HistoryManager:
         history_data = self.system_history_data if scope == 'system' else self.user_history_data
         installations = history_data['installations']
         
-        found_in_history = False
-        marked_removed = False
-        
-        for installation in installations:
-            if (installation['manager'] == manager and 
-                package_name in installation['packages']):
-                found_in_history = True
-                marked_removed = installation.get('removed', False)
-                break
-        
-        if not found_in_history:
+        installation_ids = self._get_index(scope)['installed'].get((manager, package_name))
+        if not installation_ids:
             return {
                 'found_in_history': False,
                 'still_installed': False,
                 'error': 'Package not found in history'
             }
+        marked_removed = installations[installation_ids[0]].get('removed', False)
         
         # Check if package is still installed by querying the manager
         try:
@@ -203,40 +374,62 @@ class HistoryManager:
             'details': []
         }
         
-        for installation in installations:
-            # Skip already marked as removed
-            if installation.get('removed', False):
-                continue
-            
-            manager = installation['manager']
-            packages = installation['packages']
-            
-            for package in packages:
-                reconciliation_results['checked'] += 1
-                
+        # Each (manager, package) pair is checked once, however many
+        # installations list it
+        pairs = list(dict.fromkeys(
+            (installation['manager'], package)
+            for installation in installations
+            if not installation.get('removed', False)
+            for package in installation['packages']
+        ))
+        
+        def check(pair):
+            manager, package = pair
+            return self.check_package_status(package, manager, scope)
+        
+        # Package manager queries are subprocess-bound, so run them
+        # concurrently unless parallel_operations is off; the shared registry
+        # and lookup tables are built up front rather than raced for
+        self._get_registry()
+        self._get_index(scope)
+        if len(pairs) > 1 and self.config_manager.get_setting('parallel_operations', True):
+            with ThreadPoolExecutor(max_workers=min(len(pairs), _RECONCILE_WORKERS)) as pool:
+                futures = [pool.submit(check, pair) for pair in pairs]
+            outcomes = [future.exception() or future.result() for future in futures]
+        else:
+            outcomes = []
+            for pair in pairs:
                 try:
-                    status = self.check_package_status(package, manager, scope)
-                    
-                    if status['found_in_history'] and not status['still_installed']:
-                        # Package was in history but is no longer installed
-                        # Mark it as removed
-                        self.mark_packages_removed(manager, [package], scope)
-                        reconciliation_results['marked_removed'] += 1
-                        reconciliation_results['details'].append({
-                            'package': package,
-                            'manager': manager,
-                            'action': 'marked_removed',
-                            'reason': 'Package no longer found in package manager'
-                        })
-                    
+                    outcomes.append(check(pair))
                 except Exception as e:
-                    reconciliation_results['errors'] += 1
-                    reconciliation_results['details'].append({
-                        'package': package,
-                        'manager': manager,
-                        'action': 'error',
-                        'error': str(e)
-                    })
+                    outcomes.append(e)
+        
+        removed_by_manager: Dict[str, List[str]] = {}
+        for (manager, package), status in zip(pairs, outcomes):
+            reconciliation_results['checked'] += 1
+            
+            if isinstance(status, Exception):
+                reconciliation_results['errors'] += 1
+                reconciliation_results['details'].append({
+                    'package': package,
+                    'manager': manager,
+                    'action': 'error',
+                    'error': str(status)
+                })
+            elif status['found_in_history'] and not status['still_installed']:
+                # Package was in history but is no longer installed
+                # Mark it as removed
+                removed_by_manager.setdefault(manager, []).append(package)
+                reconciliation_results['marked_removed'] += 1
+                reconciliation_results['details'].append({
+                    'package': package,
+                    'manager': manager,
+                    'action': 'marked_removed',
+                    'reason': 'Package no longer found in package manager'
+                })
+        
+        for manager, packages in removed_by_manager.items():
+            self.mark_packages_removed(manager, packages, scope)
         
         return reconciliation_results
     
@@ -252,18 +445,12 @@ class HistoryManager:
             'scope': scope
         }
         
-        history_data['rollbacks'].append(rollback_record)
-        history_data['metadata']['total_rollbacks'] += 1
-        history_data['metadata']['last_updated'] = datetime.now().isoformat()
-        
-        self._save_history(scope)
+        self._append_event(scope, {'op': 'rollback', 'rollback': rollback_record})
         
         self.logger.info(f"Recorded {scope} rollback: installation {installation_id} - {reason}")
     
     def perform_rollback(self, installation_id: int, scope: str = 'user', purge: bool = False) -> Dict[str, Any]:
         """Perform a rollback by uninstalling packages from a specific installation"""
-        from .package_managers import PackageManagerRegistry
-        
         # Get the installation record
         installation = self.get_installation(installation_id, scope)
         if not installation:
@@ -273,9 +460,7 @@ class HistoryManager:
             }
         
         # Get the package manager instance
-        config_manager = self.config_manager
-        registry = PackageManagerRegistry(config_manager)
-        manager_instance = registry.get_manager(installation['manager'])
+        manager_instance = self._get_registry().get_manager(installation['manager'])
         
         if not manager_instance:
             return {
@@ -367,6 +552,11 @@ class HistoryManager:
         
         return all_installations
     
+    def installation_count(self) -> int:
+        """Number of installations recorded in user and system history"""
+        return (len(self.user_history_data['installations']) +
+                len(self.system_history_data['installations']))
+    
     def get_installation(self, installation_id: int, scope: str = 'user') -> Optional[Dict[str, Any]]:
         """Get a specific installation record"""
         if scope == 'system' and not self.privilege_manager.can_access_system_history():
@@ -432,27 +622,19 @@ class HistoryManager:
             return []
         
         history_data = self.system_history_data if scope == 'system' else self.user_history_data
+        installations = history_data['installations']
+        index = self._get_index(scope)
         query = query.lower()
-        results = []
-        
-        for installation in history_data['installations']:
-            # Search in package names
-            packages = [p.lower() for p in installation['packages']]
-            if any(query in p for p in packages):
-                results.append(installation)
-                continue
-            
-            # Search in manager name
-            if query in installation['manager'].lower():
-                results.append(installation)
-                continue
-            
-            # Search in dependencies
-            dependencies = [d.lower() for d in installation['dependencies']]
-            if any(query in d for d in dependencies):
-                results.append(installation)
         
-        return results
+        # Match against each distinct package, manager and dependency name
+        # once, rather than against every installation's copy of it
+        matches = set()
+        for table in ('packages', 'managers', 'dependencies'):
+            for name, installation_ids in index[table].items():
+                if query in name:
+                    matches.update(installation_ids)
+        
+        return [installations[i] for i in sorted(matches)]
     
     def handle_history_command(self, args: List[str], options: Dict[str, Any]) -> int:
         """Handle history command operations"""
@@ -570,6 +752,7 @@ class HistoryManager:
                 return 1
             
             if options.get('yes') or input(f"Clear {scope} history? (y/N): ").lower() == 'y':
+                self._indexes.pop(scope, None)
                 if scope == 'system':
                     self.system_history_data['installations'] = []
                     self.system_history_data['rollbacks'] = []
@@ -672,8 +855,8 @@ class HistoryManager:
         initial_count = len(installations)
         
         # Remove old installations based on retention days
-        cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        cutoff_date = cutoff_date.replace(day=cutoff_date.day - retention_days)
+        now = datetime.now()
+        cutoff_date = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=retention_days)
         
         installations_to_keep = []
         for installation in installations:
@@ -689,10 +872,11 @@ class HistoryManager:
         if len(installations_to_keep) > max_entries:
             installations_to_keep = installations_to_keep[-max_entries:]
         
-        # Update history data
+        # Update history data; ids shift, so the lookup tables are rebuilt on demand
         history_data['installations'] = installations_to_keep
+        self._indexes.pop(scope, None)
         history_data['metadata']['total_installations'] = len(installations_to_keep)
-        history_data['metadata']['last_updated'] = datetime.now().isoformat()
+        history_data['metadata']['last_updated'] = now.isoformat()
         
         # Save history
         self._save_history(scope)
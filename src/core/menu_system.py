@@ -100,8 +100,7 @@ class MenuSystem:
         
         # Show configuration data
         self.ui_manager.display_note("Configuration Data:")
-        import json
-        print(json.dumps(self.config_manager.load_config(), indent=2))
+        self.config_manager.show_config()
     
     def _show_scope_menu(self) -> int:
         """Show scope configuration menu"""
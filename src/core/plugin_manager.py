@@ -18,7 +18,7 @@ from datetime import datetime
 
 from .config import ConfigManager
 from .ui import UIManager
-from .directories import DirectoryManager
+from .directories import get_directory_manager
 from .privilege import PrivilegeManager
 
 
@@ -316,14 +316,17 @@ class PluginManager:
     def __init__(self, config_manager: ConfigManager):
         """Initialize plugin manager"""
         self.config_manager = config_manager
-        self.directory_manager = DirectoryManager()
+        self.directory_manager = get_directory_manager()
         self.privilege_manager = PrivilegeManager()
         self.plugins: Dict[str, SimplePlugin] = {}
         self.logger = logging.getLogger('paka.plugin_manager')
         self.ui_manager = UIManager()
+        # event -> number of enabled plugins with actions for it
+        self._event_handler_counts: Dict[str, int] = {}
         
         # Load all plugins
         self._load_plugins()
+        self._count_event_handlers()
         
         # Clean up any missing plugins
         self._cleanup_missing_plugins()
@@ -397,6 +400,20 @@ class PluginManager:
         except Exception as e:
             self.logger.error(f"Error adding plugin to config: {e}")
     
+    def _count_event_handlers(self):
+        """Recount which events enabled plugins handle"""
+        counts: Dict[str, int] = {}
+        for plugin in self.plugins.values():
+            if plugin.is_enabled():
+                for event, actions in plugin.config.get('events', {}).items():
+                    if actions:
+                        counts[event] = counts.get(event, 0) + 1
+        self._event_handler_counts = counts
+    
+    def has_handlers(self, event: str) -> bool:
+        """Check whether any enabled plugin has actions for an event"""
+        return event in self._event_handler_counts
+    
     def get_plugin(self, name: str) -> Optional[SimplePlugin]:
         """Get a specific plugin"""
         return self.plugins.get(name)
@@ -434,6 +451,7 @@ class PluginManager:
             plugin.config['enabled'] = True
             self._save_plugin_config(plugin)
             self._add_plugin_to_config(name)
+            self._count_event_handlers()
             return True
         return False
     
@@ -446,6 +464,7 @@ class PluginManager:
                 self._save_plugin_config(plugin)
                 enabled_count += 1
         
+        self._count_event_handlers()
         return enabled_count > 0
     
     def disable_plugin(self, name: str) -> bool:
@@ -455,6 +474,7 @@ class PluginManager:
             plugin.config['enabled'] = False
             self._save_plugin_config(plugin)
             self._remove_plugin_from_config(name)
+            self._count_event_handlers()
             return True
         return False
     
@@ -485,6 +505,9 @@ class PluginManager:
     
     def trigger_event(self, event: str, context: Dict[str, Any]) -> bool:
         """Trigger an event for all enabled plugins"""
+        if not self.has_handlers(event):
+            return True
+        
         success = True
         for plugin in self.get_enabled_plugins().values():
             if not plugin.handle_event(event, context):
@@ -8,7 +8,6 @@ Handles colorful output, user interactions, and display formatting.
 import sys
 import os
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 
 
 class UIManager:
@@ -82,6 +81,15 @@ class UIManager:
         prefix = self._icon('info') + ' ' if icon else ''
         print(f"{self._colorize(prefix + message, 'cyan', bold=True)}")
     
+    def write_block(self, lines: List[str], level: str = 'info'):
+        """Display several lines with a single write, styled as info() or display_note()"""
+        if level == 'note':
+            text = '\n'.join(self._colorize(line, 'cyan') for line in lines)
+        else:
+            prefix = self._icon('info') + ' '
+            text = '\n'.join(self._colorize(prefix + line, 'cyan', bold=True) for line in lines)
+        sys.stdout.write(text + '\n')
+    
     def success(self, message: str):
         """Display success message"""
         print(f"{self._icon('success')} {self._colorize(message, 'green', bold=True)}")
@@ -403,10 +411,9 @@ paka history stats
         for i, success in enumerate(successes, 1):
             print(f"  {i}. {success}")
     
-    def display_timing(self, start_time: datetime, end_time: datetime):
-        """Display timing information"""
-        duration = end_time - start_time
-        print(f"\n⏱️  Operation completed in {duration.total_seconds():.2f} seconds") 
+    def display_timing(self, start_time: float, end_time: float):
+        """Display timing information (times from time.perf_counter())"""
+        print(f"\n⏱️  Operation completed in {end_time - start_time:.2f} seconds") 
 
     def display_menu_header(self, title: str, icon: str = 'section'):
         bar = '+' + '-' * (len(title) + 4) + '+'